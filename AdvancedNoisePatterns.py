@@ -1,7 +1,48 @@
 import torch
 import numpy as np
+from functools import partial
 from typing import Dict, List, Tuple
 
+from . import grid_cache
+from .parallel import frame_generators, frame_seed, render_sharded
+from .precision import COMPUTE_DTYPES, MEMORY_FORMATS
+from .profiling import NULL_PROFILER, StageProfiler
+
+
+class CoherentState:
+    """Generator state carried between frames by the incremental engine.
+
+    Cellular frames share one pool of feature points that drift with the music
+    instead of being redrawn every frame. Positions are a function of the seed
+    and each frame's accumulated travel, so every shard can build its own state
+    and still produce the same frames.
+    """
+
+    DRIFT_SPEED = 0.05
+
+    def __init__(self, num_points, seed=None):
+        # Index -1 is reserved for state shared by every frame
+        generator = None if seed is None else torch.Generator().manual_seed(frame_seed(seed, -1))
+        self.points = torch.rand(num_points, 2, generator=generator)
+        self.velocity = (torch.rand(num_points, 2, generator=generator) * 2 - 1) * self.DRIFT_SPEED
+
+    def drifted_points(self, travel):
+        # Points bounce between the grid edges (a triangle wave) so their
+        # positions stay continuous in time.
+        position = (self.points.unsqueeze(0) + self.velocity.unsqueeze(0) * travel.view(-1, 1, 1)) % 2
+        return 1 - (position - 1).abs()
+
+
+NOISE_TYPES = ["simplex", "cellular", "fbm", "wave", "domain_warp", "spectral_fbm", "spectral_wave"]
+# Synthesized with one inverse FFT per frame; every engine renders these batched
+SPECTRAL_NOISE_TYPES = ["spectral_fbm", "spectral_wave"]
+
+
+def _as_tensor(array):
+    # Per-frame numpy parameters as float32 tensors for the batched ops
+    return torch.from_numpy(np.ascontiguousarray(array)).float()
+
+
 class AdvancedNoisePatterns:
     @classmethod
     def INPUT_TYPES(cls):
@@ -10,8 +51,17 @@ class AdvancedNoisePatterns:
                 "noise_params": ("NOISE_PARAMS",),
                 "width": ("INT", {"default": 512, "min": 64, "max": 2048, "step": 8}),
                 "height": ("INT", {"default": 512, "min": 64, "max": 2048, "step": 8}),
-                "noise_type": (["simplex", "cellular", "fbm", "wave", "domain_warp"],),
+                "noise_type": (NOISE_TYPES,),
                 "analysis_type": ("ANALYSIS_TYPE",)
+            },
+            "optional": {
+                "engine": (["batched", "per_frame", "incremental"], {"default": "batched"}),
+                "seed": ("INT", {"default": 0, "min": 0, "max": 0xffffffffffffffff}),
+                "workers": ("INT", {"default": 1, "min": 1, "max": 64}),
+                "compute_dtype": (list(COMPUTE_DTYPES), {"default": "float32"}),
+                "memory_format": (list(MEMORY_FORMATS), {"default": "contiguous"}),
+                "profile": ("BOOLEAN", {"default": False}),
+                "resolution_mode": (["full", "auto"], {"default": "full"}),
             }
         }
 
@@ -19,16 +69,34 @@ class AdvancedNoisePatterns:
     FUNCTION = "generate_advanced_noise"
     CATEGORY = "audio/noise"
 
+    # Frames rendered together by the batched engine; bounds the size of the
+    # (frames, H, W) intermediates independently of track length.
+    FRAME_CHUNK = 256
+    # Upper bound on elements in the intermediate distance tensors used by the
+    # batched cellular generator, and the pixel tile size it prunes points with.
+    CELLULAR_BUDGET = 1 << 24
+    CELL_TILE = 8
+    CELL_GROUPS = 8
+    # Phase speed of spectral patterns, in turns per second at one cycle per frame
+    SPECTRAL_FLOW = 1.0
+    # resolution_mode "auto": smooth components are rendered on a grid up to
+    # MAX_COARSE_FACTOR times smaller per axis that still samples each cycle of
+    # their highest frequency COARSE_SAMPLES times, then upsampled bicubically.
+    # The channel mapping magnifies upsampling error, hence the wide margin;
+    # benchmarks/bench_resolution.py measures the trade-off.
+    COARSE_SAMPLES = 32
+    MAX_COARSE_FACTOR = 8
+
+    # Replaced by an enabled StageProfiler for the duration of a profiled run
+    profiler = NULL_PROFILER
+
     def generate_simplex(self, shape, freq):
-        coords = torch.stack(torch.meshgrid(
-            torch.linspace(-np.pi, np.pi, shape[0]),
-            torch.linspace(-np.pi, np.pi, shape[1])
-        ))
+        coords = grid_cache.meshgrid(-np.pi, np.pi, shape[0], shape[1])
         return torch.tanh(torch.sin(coords[0] * freq) * torch.cos(coords[1] * freq * 1.5)) * \
                torch.sigmoid(torch.cos(coords[0] * freq * 0.7) * torch.sin(coords[1] * freq * 2))
 
-    def generate_cellular(self, shape, numPoints, chaos_factor=1.0):
-        points = torch.rand(numPoints, 2) * torch.tensor(shape) * chaos_factor
+    def generate_cellular(self, shape, numPoints, chaos_factor=1.0, generator=None):
+        points = torch.rand(numPoints, 2, generator=generator) * torch.tensor(shape) * chaos_factor
         x = torch.arange(shape[0]).reshape(-1, 1).repeat(1, shape[1])
         y = torch.arange(shape[1]).reshape(1, -1).repeat(shape[0], 1)
         
@@ -57,9 +125,7 @@ class AdvancedNoisePatterns:
         return torch.tanh(noise)
 
     def generate_wave(self, shape, frequency, phases):
-        x = torch.linspace(-np.pi, np.pi, shape[1])
-        y = torch.linspace(-np.pi, np.pi, shape[0])
-        xx, yy = torch.meshgrid(x, y)
+        xx, yy = grid_cache.meshgrid(-np.pi, np.pi, shape[1], shape[0])
         
         wave1 = torch.sin(xx * frequency + phases[0]) * torch.cos(yy * frequency * 1.3 + phases[1])
         wave2 = torch.cos(xx * frequency * 0.7 + phases[1]) * torch.sin(yy * frequency * 1.7 + phases[0])
@@ -69,10 +135,7 @@ class AdvancedNoisePatterns:
 
     def domain_warp(self, noise, warp_factor, timestamp):
         height, width = noise.shape
-        grid_x, grid_y = torch.meshgrid(
-            torch.linspace(-1, 1, width),
-            torch.linspace(-1, 1, height)
-        )
+        grid_x, grid_y = grid_cache.meshgrid(-1, 1, width, height)
         
         warp = torch.stack([
             grid_x + warp_factor * torch.sin(6 * np.pi * timestamp + grid_y * 2) * torch.cos(grid_x * 3),
@@ -87,7 +150,359 @@ class AdvancedNoisePatterns:
         
         return torch.tanh(warped * 2)
 
-    def generate_advanced_noise(self, noise_params, width, height, noise_type, analysis_type):
+    def generate_simplex_batch(self, shape, freqs):
+        y = grid_cache.linspace(-np.pi, np.pi, shape[0]).view(1, -1, 1)
+        x = grid_cache.linspace(-np.pi, np.pi, shape[1]).view(1, 1, -1)
+        f = freqs.view(-1, 1, 1)
+        a, b = y * f, x * f
+        return torch.tanh(torch.sin(a) * torch.cos(b * 1.5)) * \
+               torch.sigmoid(torch.cos(a * 0.7) * torch.sin(b * 2))
+
+    def _nearest_point_distance(self, shape, points):
+        # Exact distance from every pixel to its nearest point, per frame. Pixels
+        # are grouped into CELL_TILE x CELL_TILE tiles: a point can only be the
+        # nearest one for some pixel in a tile if its distance to the tile is at
+        # most the smallest farthest-corner distance over all points, which
+        # prunes all but a handful of candidates before the per-pixel pass.
+        height, width = shape
+        tile = self.CELL_TILE
+        batch, num_points = points.shape[:2]
+        tiles_h, tiles_w = -(-height // tile), -(-width // tile)
+        num_tiles = tiles_h * tiles_w
+
+        # Per-axis distances are separable, so the (tiles, points) bounds are
+        # built from (rows, points) and (columns, points) terms.
+        def axis_bounds(count, coords):
+            low = (torch.arange(count, dtype=torch.float32) * tile).view(1, -1, 1)
+            high = low + (tile - 1)
+            c = coords.unsqueeze(1)
+            nearest = ((low - c).clamp(min=0) + (c - high).clamp(min=0)) ** 2
+            farthest = torch.maximum((c - low).abs(), (c - high).abs()) ** 2
+            return nearest, farthest
+
+        near_y, far_y = axis_bounds(tiles_h, points[..., 0])
+        near_x, far_x = axis_bounds(tiles_w, points[..., 1])
+        nearest = (near_y.unsqueeze(2) + near_x.unsqueeze(1)).view(batch, num_tiles, num_points)
+        farthest = (far_y.unsqueeze(2) + far_x.unsqueeze(1)).view(batch, num_tiles, num_points)
+        bound = farthest.min(dim=2, keepdim=True)[0]
+        nearest = nearest.view(batch * num_tiles, num_points)
+        counts = (nearest <= bound.view(-1, 1)).sum(-1)
+
+        offsets = torch.stack(torch.meshgrid(
+            torch.arange(tile, dtype=torch.float32),
+            torch.arange(tile, dtype=torch.float32),
+            indexing="ij"
+        ), dim=-1).view(1, -1, 2)
+        origins = torch.stack(torch.meshgrid(
+            torch.arange(tiles_h, dtype=torch.float32) * tile,
+            torch.arange(tiles_w, dtype=torch.float32) * tile,
+            indexing="ij"
+        ), dim=-1).view(num_tiles, 1, 2)
+
+        # Candidate counts vary a lot between tiles (tiles far from a dense
+        # cluster see many more), so tiles are grouped by count and each group
+        # is padded only to its own maximum.
+        squared = torch.empty((batch * num_tiles, tile * tile))
+        order = torch.argsort(counts)
+        group = -(-len(order) // self.CELL_GROUPS)
+        for start in range(0, len(order), group):
+            rows = order[start:start + group]
+            k = int(counts[rows].max())
+            step = max(1, self.CELLULAR_BUDGET // (tile * tile * k))
+            for sub in range(0, len(rows), step):
+                r = rows[sub:sub + step]
+                index = nearest[r].topk(k, dim=1, largest=False)[1]
+                candidates = points[r // num_tiles].gather(1, index.unsqueeze(-1).expand(-1, -1, 2)).unsqueeze(1)
+                pixels = (origins[r % num_tiles] + offsets).unsqueeze(2)
+                squared[r] = torch.min(
+                    (pixels[..., 0] - candidates[..., 0]) ** 2 + (pixels[..., 1] - candidates[..., 1]) ** 2, dim=-1
+                )[0]
+
+        squared = squared.view(batch, tiles_h, tiles_w, tile, tile).permute(0, 1, 3, 2, 4)
+        return torch.sqrt(squared.reshape(batch, tiles_h * tile, tiles_w * tile)[:, :height, :width])
+
+    def generate_cellular_batch(self, shape, num_points, chaos, generators=None):
+        batch = len(num_points)
+        max_points = int(num_points.max())
+        if generators is None:
+            points = torch.rand(batch, max_points, 2)
+        else:
+            # Each frame draws exactly its own points from its own generator
+            points = torch.zeros((batch, max_points, 2))
+            for i, (count, generator) in enumerate(zip(num_points.tolist(), generators)):
+                points[i, :count] = torch.rand(count, 2, generator=generator)
+        points = points * torch.tensor(shape) * chaos.view(-1, 1, 1)
+        # Padding points are pushed far outside the grid so they never win the min
+        unused = torch.arange(max_points).view(1, -1) >= num_points.view(-1, 1)
+        points[unused] = 1e6
+        return self.cellular_from_points(shape, points)
+
+    def cellular_from_points(self, shape, points):
+        height, width = shape
+        # Keep the (frames, tiles, points) bound tensors within budget
+        tiles = -(-height // self.CELL_TILE) * -(-width // self.CELL_TILE)
+        step = max(1, self.CELLULAR_BUDGET // (tiles * points.shape[1]))
+        out = torch.empty((len(points), height, width))
+        for start in range(0, len(points), step):
+            p = points[start:start + step]
+            distances1 = self._nearest_point_distance(shape, p)
+            distances2 = self._nearest_point_distance(shape, p * torch.tensor([1.5, 0.8]))
+            out[start:start + step] = torch.sin(distances1 * 0.2) * torch.cos(distances2 * 0.15)
+        return out
+
+    def generate_fbm_batch(self, shape, octaves, persistence, lacunarity, chaos, resolution_mode="full"):
+        noise = torch.zeros((len(octaves),) + tuple(shape))
+        # Low octaves summed on coarse grids, keyed by reduction factor; upsampling
+        # is linear, so each sum is upsampled once at the end
+        coarse = {}
+        amplitude = np.ones(len(octaves))
+        frequency = np.ones(len(octaves))
+
+        for i in range(int(octaves.max())):
+            active = np.nonzero(octaves > i)[0]
+            factors = self._coarse_factors(shape, 2 * frequency[active] * chaos[active], resolution_mode)
+            for factor in np.unique(factors):
+                frames = active[factors == factor]
+                grid = self._coarse_shape(shape, factor)
+                layer = self.generate_simplex_batch(grid, torch.from_numpy(frequency[frames] * chaos[frames]).float())
+                target = noise if factor == 1 else coarse.setdefault(factor, torch.zeros((len(octaves),) + grid))
+                target[frames] += torch.from_numpy(amplitude[frames]).float().view(-1, 1, 1) * layer
+            amplitude *= persistence * (1 + chaos * 0.2)
+            frequency *= lacunarity * (1 + chaos * 0.1)
+
+        for layers in coarse.values():
+            noise += self._upsample(layers, shape)
+        return torch.tanh(noise)
+
+    def generate_wave_batch(self, shape, frequency, phases):
+        # Every term is separable in x and y (wave3 after expanding its sum and
+        # difference angles), so each frame is a rank-6 product of (H, 6) and
+        # (6, W) factors instead of six full-resolution trig evaluations.
+        xx = grid_cache.linspace(-np.pi, np.pi, shape[0]).view(1, -1)
+        yy = grid_cache.linspace(-np.pi, np.pi, shape[1]).view(1, -1)
+        f = frequency.view(-1, 1)
+        phase_x, phase_y = phases[0].view(-1, 1), phases[1].view(-1, 1)
+
+        sx5, cx5 = torch.sin(xx * f * 0.5), torch.cos(xx * f * 0.5)
+        sx8, cx8 = torch.sin(xx * f * 0.8), torch.cos(xx * f * 0.8)
+        sy5, cy5 = torch.sin(yy * f * 0.5), torch.cos(yy * f * 0.5)
+        sy8, cy8 = torch.sin(yy * f * 0.8), torch.cos(yy * f * 0.8)
+
+        rows = torch.stack([
+            torch.sin(xx * f + phase_x),
+            torch.cos(xx * f * 0.7 + phase_y),
+            sx5 * cx8, sx5 * sx8, cx5 * cx8, cx5 * sx8
+        ], dim=2)
+        cols = torch.stack([
+            torch.cos(yy * f * 1.3 + phase_y),
+            torch.sin(yy * f * 1.7 + phase_x),
+            cy5 * cy8, cy5 * sy8, sy5 * cy8, sy5 * sy8
+        ], dim=1)
+
+        return torch.bmm(rows, cols) / 3
+
+    def _spectral_phases(self, shape, seed=None):
+        # One random phase per frequency, shared by every frame so patterns
+        # evolve instead of flickering; index -1 as in CoherentState
+        generator = None if seed is None else torch.Generator().manual_seed(frame_seed(seed, -1))
+        return 2 * np.pi * torch.rand(shape[0], shape[1] // 2 + 1, generator=generator)
+
+    def _synthesize(self, amplitude, phase, shape):
+        # A single batched inverse FFT for all frames, each scaled to unit variance
+        field = torch.fft.irfft2(torch.polar(amplitude, phase), s=tuple(shape))
+        return field / field.std(dim=(1, 2), keepdim=True).clamp_min(1e-12)
+
+    def generate_spectral_fbm_batch(self, shape, octaves, persistence, lacunarity, chaos, timestamps, seed=None):
+        # fbm as a power-law band: generate_fbm's octaves span chaos to
+        # chaos * step ** (octaves - 1) cycles per frame, each `gain` times the
+        # last, so mode amplitudes follow (k / chaos) ** (log(gain) / log(step) - 1)
+        # (the -1 spreads each octave over its ~k modes). Cost is independent of
+        # the octave count.
+        _, _, k = grid_cache.rfft_frequencies(shape[0], shape[1])
+        gain = persistence * (1 + chaos * 0.2)
+        step = lacunarity * (1 + chaos * 0.1)
+        low = torch.from_numpy(chaos).float().view(-1, 1, 1)
+        high = torch.from_numpy(np.maximum(chaos * step ** (octaves - 1), 1.0)).float().view(-1, 1, 1)
+        slope = torch.from_numpy(np.log(gain) / np.log(step) - 1).float().view(-1, 1, 1)
+
+        # Low-chaos frames still start at the lowest nonzero frequency, one cycle
+        in_band = (k >= low.clamp(max=1.0)) & (k <= high)
+        amplitude = torch.where(in_band, (k.clamp_min(1e-6) / low) ** slope, torch.zeros(()))
+        # Finer detail drifts faster than the large shapes
+        t = torch.from_numpy(timestamps).float().view(-1, 1, 1)
+        phase = self._spectral_phases(shape, seed) + 2 * np.pi * self.SPECTRAL_FLOW * t * torch.sqrt(k)
+        return torch.tanh(self._synthesize(amplitude, phase, shape))
+
+    def generate_spectral_wave_batch(self, shape, frequency, phases, chaos, seed=None):
+        # Interfering waves: a ring of modes around `frequency` cycles per frame,
+        # wider for chaotic frames, translated by the same phases as generate_wave.
+        k_rows, k_cols, k = grid_cache.rfft_frequencies(shape[0], shape[1])
+        center = frequency.clamp(max=min(shape) / 2).view(-1, 1, 1)
+        width = torch.clamp(0.15 * torch.from_numpy(chaos).float().view(-1, 1, 1) * center, min=0.75)
+        amplitude = torch.exp(-0.5 * ((k - center) / width) ** 2) * (k > 0)
+        phase = self._spectral_phases(shape, seed) + \
+                (phases[0].view(-1, 1, 1) * k_rows + phases[1].view(-1, 1, 1) * k_cols) / center
+        return self._synthesize(amplitude, phase, shape)
+
+    def domain_warp_batch(self, noise, warp_factor, timestamps):
+        _, height, width = noise.shape
+        grid_x = grid_cache.linspace(-1, 1, height).view(1, -1, 1)
+        grid_y = grid_cache.linspace(-1, 1, width).view(1, 1, -1)
+        w = warp_factor.view(-1, 1, 1)
+        t = 6 * np.pi * timestamps.double()
+        sin_t, cos_t = torch.sin(t).float().view(-1, 1, 1), torch.cos(t).float().view(-1, 1, 1)
+
+        # sin(t + 2y) and cos(t + 2x) expanded over the cached sin/cos bases
+        sin_2x, cos_2x = (b.view(1, -1, 1) for b in grid_cache.sin_cos_basis(-1, 1, height, 2))
+        sin_2y, cos_2y = (b.view(1, 1, -1) for b in grid_cache.sin_cos_basis(-1, 1, width, 2))
+        cos_3x = grid_cache.sin_cos_basis(-1, 1, height, 3)[1].view(1, -1, 1)
+        sin_3y = grid_cache.sin_cos_basis(-1, 1, width, 3)[0].view(1, 1, -1)
+
+        warp = torch.stack([
+            grid_x + w * (sin_t * cos_2y + cos_t * sin_2y) * cos_3x,
+            grid_y + w * (cos_t * cos_2x - sin_t * sin_2x) * sin_3y
+        ], dim=-1)
+
+        warped = torch.nn.functional.grid_sample(
+            noise.unsqueeze(1),
+            warp,
+            align_corners=False
+        )[:, 0]
+
+        return torch.tanh(warped * 2)
+
+    def _coarse_factors(self, shape, max_freq, resolution_mode):
+        # Per frame, the largest power-of-two grid reduction for a component
+        # whose highest frequency is `max_freq` cycles per frame
+        if resolution_mode != "auto":
+            return np.ones(len(max_freq), dtype=np.int64)
+        limit = min(shape) / (np.maximum(max_freq, 1e-6) * self.COARSE_SAMPLES)
+        factor = 2 ** np.floor(np.log2(np.maximum(limit, 1.0)))
+        return np.minimum(factor, self.MAX_COARSE_FACTOR).astype(np.int64)
+
+    def _coarse_shape(self, shape, factor):
+        return (max(2, -(-shape[0] // factor)), max(2, -(-shape[1] // factor)))
+
+    def _upsample(self, noise, shape):
+        # Bicubic with align_corners=True, since the generators sample [start, end]
+        # inclusive; two matmuls are ~9x faster than F.interpolate here
+        if tuple(noise.shape[1:]) == tuple(shape):
+            return noise
+        rows = grid_cache.cubic_upsample_matrix(shape[0], noise.shape[1])
+        cols = grid_cache.cubic_upsample_matrix(shape[1], noise.shape[2])
+        return rows @ noise @ cols.T
+
+    def _render_multires(self, shape, factors, render):
+        # render(shape, frames) gives the component for the selected frames on a
+        # grid of `shape`; frames are grouped by their coarse factor
+        if (factors == factors[0]).all():
+            return self._upsample(render(self._coarse_shape(shape, factors[0]), slice(None)), shape)
+        out = torch.empty((len(factors),) + tuple(shape))
+        for factor in np.unique(factors):
+            frames = np.nonzero(factors == factor)[0]
+            out[frames] = self._upsample(render(self._coarse_shape(shape, factor), frames), shape)
+        return out
+
+    def _frame_params(self, timestamps, intensity):
+        timestamps = np.asarray(timestamps, dtype=np.float64)
+        time_scale = (timestamps / (timestamps[-1] or 1.0)) ** 0.3
+        energy_factor = intensity * (1 + np.exp(time_scale * 2) - 1)
+        return {
+            "index": np.arange(len(timestamps)),
+            "timestamp": timestamps,
+            "energy_factor": energy_factor,
+            "chaos": 0.5 + np.abs(np.sin(timestamps * 10)) * 2,
+            # How far incremental cellular points have drifted: louder passages move them faster
+            "travel": np.concatenate([[0.0], np.cumsum(np.abs(np.diff(timestamps)) * energy_factor[1:])]),
+        }
+
+    def _render_pattern(self, noise_type, frame, shape, seed=None, state=None, resolution_mode="full"):
+        timestamp = frame["timestamp"]
+        energy_factor = frame["energy_factor"]
+        chaos = frame["chaos"]
+
+        # Highest frequencies, in cycles per frame: simplex reaches 2 * freq
+        # along columns, wave 1.7 * freq
+        if noise_type == "simplex":
+            freq = 1 + energy_factor * 30
+            base_noise = self._render_multires(
+                shape, self._coarse_factors(shape, 2 * freq, resolution_mode),
+                lambda grid, frames: self.generate_simplex_batch(grid, _as_tensor(freq[frames])))
+
+        elif noise_type == "cellular":
+            points = (3 + energy_factor * 150).astype(np.int64)
+            if state is None:
+                base_noise = self.generate_cellular_batch(shape, torch.from_numpy(points), _as_tensor(chaos),
+                                                          frame_generators(seed, frame["index"]))
+            else:
+                drifted = state.drifted_points(_as_tensor(frame["travel"]))
+                drifted = drifted * torch.tensor(shape) * _as_tensor(chaos).view(-1, 1, 1)
+                drifted[torch.arange(drifted.shape[1]).view(1, -1) >= torch.from_numpy(points).view(-1, 1)] = 1e6
+                base_noise = self.cellular_from_points(shape, drifted[:, :int(points.max())])
+
+        elif noise_type == "fbm":
+            octaves = (2 + energy_factor * 6).astype(np.int64)
+            persistence = 0.2 + energy_factor * 0.8
+            lacunarity = 1.2 + energy_factor * 4
+            base_noise = self.generate_fbm_batch(shape, octaves, persistence, lacunarity, chaos, resolution_mode)
+
+        elif noise_type == "wave":
+            freq = 0.3 + energy_factor * 12
+            phase_x = timestamp * 8 * np.pi * chaos
+            phase_y = timestamp * 6 * np.pi * (2 - chaos)
+            base_noise = self._render_multires(
+                shape, self._coarse_factors(shape, 1.7 * freq, resolution_mode),
+                lambda grid, frames: self.generate_wave_batch(
+                    grid, _as_tensor(freq[frames]), [_as_tensor(phase_x[frames]), _as_tensor(phase_y[frames])]))
+
+        elif noise_type == "domain_warp":
+            # Always full resolution: the warp, not its smooth source, is the cost,
+            # and it magnifies upsampling error
+            base_noise = self.generate_simplex_batch(shape, _as_tensor(2 * chaos))
+            warp_factor = 0.1 + energy_factor * 1.2
+            base_noise = self.domain_warp_batch(base_noise, _as_tensor(warp_factor), torch.from_numpy(timestamp))
+
+        elif noise_type == "spectral_fbm":
+            octaves = (2 + energy_factor * 6).astype(np.int64)
+            persistence = 0.2 + energy_factor * 0.8
+            lacunarity = 1.2 + energy_factor * 4
+            base_noise = self.generate_spectral_fbm_batch(shape, octaves, persistence, lacunarity, chaos, timestamp,
+                                                          seed)
+
+        elif noise_type == "spectral_wave":
+            freq = 0.3 + energy_factor * 12
+            phase_x = timestamp * 8 * np.pi * chaos
+            phase_y = timestamp * 6 * np.pi * (2 - chaos)
+            base_noise = self.generate_spectral_wave_batch(shape, _as_tensor(freq),
+                                                           [_as_tensor(phase_x), _as_tensor(phase_y)], chaos, seed)
+
+        return base_noise
+
+    def _render_batch(self, noise_type, frame, shape, seed=None, state=None, dtype=torch.float32,
+                      resolution_mode="full"):
+        energy_factor = frame["energy_factor"]
+        chaos = frame["chaos"]
+        frames = len(chaos)
+
+        with self.profiler.stage(f"pattern:{noise_type}", frames):
+            base_noise = self._render_pattern(noise_type, frame, shape, seed, state, resolution_mode)
+
+        with self.profiler.stage("normalize", frames):
+            low = base_noise.amin(dim=(1, 2), keepdim=True)
+            high = base_noise.amax(dim=(1, 2), keepdim=True)
+            base_noise = (base_noise - low) / (high - low)
+
+        # The channel mapping amplifies base-noise error by up to ~2 * 20 * energy_factor,
+        # so patterns are always computed in float32 and only the latents are stored in `dtype`
+        with self.profiler.stage("channels", frames) as record:
+            channel_phase = np.arange(4) * np.pi / 2 * chaos[:, None]
+            channel_noise = torch.sin(base_noise.unsqueeze(1) * _as_tensor(8 + channel_phase)[..., None, None]) * \
+                            _as_tensor(energy_factor).view(-1, 1, 1, 1)
+            latents = torch.tanh(channel_noise * 2).to(dtype)
+            record["tensor_bytes"] = latents.nbytes
+        return latents
+
+    def _merge_noise_params(self, noise_params):
         # Initialize default noise parameters if not provided
         default_noise_params = {
             "timestamps": [0.0, 0.5, 1.0],
@@ -95,7 +510,9 @@ class AdvancedNoisePatterns:
             "cellular": {"intensity": 1.0},
             "fbm": {"intensity": 1.0, "persistence": 0.5},
             "wave": {"intensity": 1.0},
-            "domain_warp": {"intensity": 1.0}
+            "domain_warp": {"intensity": 1.0},
+            "spectral_fbm": {"intensity": 1.0},
+            "spectral_wave": {"intensity": 1.0}
         }
         
         # Merge provided parameters with defaults
@@ -105,15 +522,88 @@ class AdvancedNoisePatterns:
             for key in default_noise_params:
                 if key not in noise_params:
                     noise_params[key] = default_noise_params[key]
+        return noise_params
+
+    def _iter_frames(self, noise_params, width, height, noise_type, start, stop, chunk_size, seed=None,
+                     incremental=False, dtype=torch.float32, resolution_mode="full"):
+        intensity = noise_params[noise_type].get("intensity", 1.0)
+        frames = self._frame_params(noise_params["timestamps"], intensity)
+        shape = (height//8, width//8)
+        state = None
+        if incremental:
+            # The point pool covers the loudest frame of the whole track, so every shard draws the same pool
+            state = CoherentState(int(3 + frames["energy_factor"].max() * 150), seed)
+        for first in range(start, stop, chunk_size):
+            last = min(first + chunk_size, stop)
+            chunk = {k: v[first:last] for k, v in frames.items()}
+            yield first, self._render_batch(noise_type, chunk, shape, seed, state, dtype, resolution_mode)
+
+    def _render_range(self, noise_params, width, height, noise_type, seed, incremental, resolution_mode, out, start,
+                      stop):
+        for first, chunk in self._iter_frames(noise_params, width, height, noise_type, start, stop, self.FRAME_CHUNK,
+                                              seed, incremental, out.dtype, resolution_mode):
+            out[first:first + len(chunk)] = chunk
+
+    def iter_advanced_noise(self, noise_params, width, height, noise_type, max_resident_frames=None, seed=None,
+                            incremental=False, dtype=torch.float32, start=0, stop=None, resolution_mode="full"):
+        """Yield ``(start, latents)`` chunks of at most ``max_resident_frames`` frames.
+
+        ``start``/``stop`` select a frame range; frames are identical to the
+        same frames of a full render.
+        """
+        noise_params = self._merge_noise_params(noise_params)
+        timestamps = noise_params["timestamps"]
+        if len(timestamps) == 0:
+            yield 0, torch.zeros((1, 4, height//8, width//8), dtype=dtype)
+            return
+
+        chunk_size = max(1, max_resident_frames or self.FRAME_CHUNK)
+        stop = len(timestamps) if stop is None else min(stop, len(timestamps))
+        yield from self._iter_frames(noise_params, width, height, noise_type, start, stop, chunk_size, seed,
+                                     incremental, dtype, resolution_mode)
+
+    def generate_advanced_noise(self, noise_params, width, height, noise_type, analysis_type, engine="batched",
+                                seed=0, workers=1, compute_dtype="float32", memory_format="contiguous",
+                                profile=False, resolution_mode="full"):
+        self.profiler = StageProfiler("AdvancedNoisePatterns", True if profile else None)
+        try:
+            with self.profiler.stage("generate") as record:
+                result = self._generate_advanced_noise(noise_params, width, height, noise_type, engine, seed,
+                                                       workers, compute_dtype, memory_format, resolution_mode)
+                record["frames"] = len(result[0]["samples"])
+                record["tensor_bytes"] = result[0]["samples"].nbytes
+            if self.profiler.enabled:
+                note = None
+                if workers > 1 and engine != "per_frame":
+                    note = "(per-chunk stages ran in worker processes and are not included)"
+                print(self.profiler.finish(note))
+            return result
+        finally:
+            self.profiler = NULL_PROFILER
+
+    def _generate_advanced_noise(self, noise_params, width, height, noise_type, engine, seed, workers,
+                                 compute_dtype, memory_format, resolution_mode="full"):
+        noise_params = self._merge_noise_params(noise_params)
+        dtype = COMPUTE_DTYPES[compute_dtype]
+        memory_format = MEMORY_FORMATS[memory_format]
         
         timestamps = noise_params["timestamps"]
         if len(timestamps) == 0:
-            return ({"samples": torch.zeros((1, 4, height//8, width//8))}, [0.0])
+            return ({"samples": torch.zeros((1, 4, height//8, width//8), dtype=dtype)}, [0.0])
         
         batch_size = len(timestamps)
         latent_height, latent_width = height//8, width//8
+
+        if engine in ("batched", "incremental") or noise_type in SPECTRAL_NOISE_TYPES:
+            # Per-frame seeds make the output independent of how frames are sharded
+            incremental = engine == "incremental"
+            task = partial(self._render_range, noise_params, width, height, noise_type, seed, incremental,
+                           resolution_mode)
+            noise_batch = render_sharded(task, batch_size, (4, latent_height, latent_width), workers, dtype,
+                                         memory_format)
+            return ({"samples": noise_batch}, timestamps)
+
         noise_batch = torch.zeros((batch_size, 4, latent_height, latent_width))
-        
         base_params = noise_params[noise_type]
         intensity = base_params.get("intensity", 1.0)
         persistence = base_params.get("persistence", 0.5)
@@ -129,7 +619,8 @@ class AdvancedNoisePatterns:
                 
             elif noise_type == "cellular":
                 points = int(3 + energy_factor * 150)
-                base_noise = self.generate_cellular((latent_height, latent_width), points, chaos)
+                generator = frame_generators(seed, [i])[0]
+                base_noise = self.generate_cellular((latent_height, latent_width), points, chaos, generator)
                 
             elif noise_type == "fbm":
                 octaves = int(2 + energy_factor * 6)
@@ -155,7 +646,7 @@ class AdvancedNoisePatterns:
                 channel_noise = torch.sin(base_noise * (8 + channel_phase)) * energy_factor
                 noise_batch[i, c] = torch.tanh(channel_noise * 2)
 
-        return ({"samples": noise_batch}, timestamps)
+        return ({"samples": noise_batch.to(dtype=dtype, memory_format=memory_format)}, timestamps)
 
 NODE_CLASS_MAPPINGS = {
     "AdvancedNoisePatterns": AdvancedNoisePatterns
@@ -1,6 +1,15 @@
 import torch
 import math
+import numpy as np
+from functools import partial
 from .audio_noise_nodes import NoiseParams
+from .grid_cache import get_grid_cache
+from .parallel import frame_generators, random_frames, render_sharded
+from .precision import COMPUTE_DTYPES, MEMORY_FORMATS
+from .profiling import NULL_PROFILER, StageProfiler
+
+NOISE_TYPES = ["gaussian", "salt_pepper", "perlin"]
+
 
 class NoiseToLatentConverter:
     def __init__(self):
@@ -14,8 +23,15 @@ class NoiseToLatentConverter:
                 "width": ("INT", {"default": 512, "min": 64, "max": 2048, "step": 8}),
                 "height": ("INT", {"default": 512, "min": 64, "max": 2048, "step": 8}),
                 "batch_size": ("INT", {"default": 1, "min": 1, "max": 64}),
-                "noise_type": (["gaussian", "salt_pepper", "perlin"],),
+                "noise_type": (NOISE_TYPES,),
                 "analysis_type": ("ANALYSIS_TYPE",),
+            },
+            "optional": {
+                "seed": ("INT", {"default": 0, "min": 0, "max": 0xffffffffffffffff}),
+                "workers": ("INT", {"default": 1, "min": 1, "max": 64}),
+                "compute_dtype": (list(COMPUTE_DTYPES), {"default": "float32"}),
+                "memory_format": (list(MEMORY_FORMATS), {"default": "contiguous"}),
+                "profile": ("BOOLEAN", {"default": False}),
             }
         }
 
@@ -23,29 +39,70 @@ class NoiseToLatentConverter:
     FUNCTION = "generate_latent_noise"
     CATEGORY = "audio/noise"
 
-    def rand_perlin_2d(self, shape, res, fade=lambda t: 6*t**5 - 15*t**4 + 10*t**3):
-        delta = (res[0] / shape[0], res[1] / shape[1])
-        d = (shape[0] // res[0], shape[1] // res[1])
-        grid = torch.stack(torch.meshgrid(torch.arange(0, res[0], delta[0]), torch.arange(0, res[1], delta[1])), dim=-1) % 1
-        angles = 2*math.pi*torch.rand(res[0]+1, res[1]+1)
-        gradients = torch.stack((torch.cos(angles), torch.sin(angles)), dim=-1)
-        
-        tile_grads = lambda slice1, slice2: gradients[slice1[0]:slice1[1], slice2[0]:slice2[1]].repeat_interleave(d[0], 0).repeat_interleave(d[1], 1)
-        dot = lambda grad, shift: (torch.stack((grid[:shape[0],:shape[1],0] + shift[0], grid[:shape[0],:shape[1], 1] + shift[1]), dim=-1) * grad[:shape[0], :shape[1]]).sum(dim=-1)
-        
-        n00 = dot(tile_grads([0, -1], [0, -1]), [0, 0])
-        n10 = dot(tile_grads([1, None], [0, -1]), [-1, 0])
-        n01 = dot(tile_grads([0, -1], [1, None]), [0, -1])
-        n11 = dot(tile_grads([1, None], [1, None]), [-1, -1])
-        
-        t = fade(grid[:shape[0], :shape[1]])
-        return math.sqrt(2) * torch.lerp(torch.lerp(n00, n10, t[..., 0]), torch.lerp(n01, n11, t[..., 0]), t[..., 1])
+    FRAME_CHUNK = 64
+
+    # Replaced by an enabled StageProfiler for the duration of a profiled run
+    profiler = NULL_PROFILER
+
+    def _perlin_axis_weights(self, size, res, fade):
+        # Interpolation weights from the res+1 lattice points of one axis onto
+        # `size` samples: `value` carries the fade weights, `gradient` the fade
+        # weights times the signed offset to each lattice point.
+        pos = torch.arange(size, dtype=torch.float32) * (res / size)
+        cell = pos.floor().long().clamp(max=res - 1)
+        frac = pos - cell
+        t = fade(frac)
+        rows = torch.arange(size)
+        value = torch.zeros((size, res + 1))
+        gradient = torch.zeros((size, res + 1))
+        value[rows, cell] = 1 - t
+        value[rows, cell + 1] = t
+        gradient[rows, cell] = (1 - t) * frac
+        gradient[rows, cell + 1] = t * (frac - 1)
+        return value, gradient
+
+    def rand_perlin_2d_batched(self, count, shape, res, octaves=1, persistence=0.5,
+                               fade=lambda t: 6*t**5 - 15*t**4 + 10*t**3, generators=None, dtype=torch.float32):
+        # Perlin noise is bilinear in the lattice gradients, so every field is
+        # two small matrix products: rows @ gradients @ cols. Lattice
+        # coordinates are continuous, so shapes need not be divisible by res.
+        # With `generators`, each one draws count // len(generators) fields.
+        # Fields are multiplied out in `dtype`; octaves are summed in float32.
+        noise = torch.zeros((count,) + tuple(shape))
+        amplitude = 1.0
+        for octave in range(octaves):
+            r = (res[0] * 2 ** octave, res[1] * 2 ** octave)
+            value_y, gradient_y = get_grid_cache().get(
+                ("perlin_axis", shape[0], r[0], fade), lambda: self._perlin_axis_weights(shape[0], r[0], fade))
+            value_x, gradient_x = get_grid_cache().get(
+                ("perlin_axis", shape[1], r[1], fade), lambda: self._perlin_axis_weights(shape[1], r[1], fade))
+
+            if generators is None:
+                angles = 2*math.pi*torch.rand(count, r[0]+1, r[1]+1)
+            else:
+                per_generator = (count // len(generators), r[0]+1, r[1]+1)
+                angles = 2*math.pi*random_frames(torch.rand, per_generator, len(generators), generators)
+                angles = angles.view(count, r[0]+1, r[1]+1)
+            cos, sin = torch.cos(angles).to(dtype), torch.sin(angles).to(dtype)
+            field = gradient_y.to(dtype) @ cos @ value_x.T.to(dtype) + \
+                    value_y.to(dtype) @ sin @ gradient_x.T.to(dtype)
+            noise += amplitude * math.sqrt(2) * field
+            amplitude *= persistence
+        return noise
 
-    def generate_latent_noise(self, noise_params, width, height, batch_size, noise_type, analysis_type):
-        latent_height = height // 8
-        latent_width = width // 8
+    def _adjusted_params(self, noise_params, noise_type, analysis_type, batch_size=1):
+        # With windowed params ("windowed" mode of the mapper) each frame gets
+        # its own values as (batch_size,) arrays; frame i reads the entry at
+        # the same relative position in the track, i.e. entry i when there is
+        # one frame per timestamp.
         params = {k: v for k, v in noise_params.items() if k != "timestamps"}
         selected_params = params[noise_type]
+        windowed = params.get("windowed", {}).get(noise_type)
+        if windowed:
+            count = len(windowed["intensity"])
+            index = np.arange(batch_size) * count // batch_size
+            selected_params = {k: np.asarray(windowed[k], dtype=np.float64)[index]
+                               for k in ("intensity", "grain", "persistence")}
         
         intensity = selected_params["intensity"]
         grain = selected_params["grain"]
@@ -62,26 +119,50 @@ class NoiseToLatentConverter:
             grain *= 1.5
             persistence *= 0.8
 
-        noise = torch.zeros((batch_size, 4, latent_height, latent_width), dtype=torch.float32, device="cpu")
+        return intensity, grain, persistence
+
+    def _chunk_params(self, adjusted, start, stop):
+        # Scalars pass through; per-frame arrays become (frames, 1, 1, 1) tensors
+        return [torch.from_numpy(p[start:stop]).float().view(-1, 1, 1, 1) if isinstance(p, np.ndarray) else p
+                for p in adjusted]
+
+    def _render_noise(self, batch_size, latent_height, latent_width, noise_type, analysis_type,
+                      intensity, grain, persistence, generators=None, dtype=torch.float32):
+        with self.profiler.stage(f"noise:{noise_type}", batch_size) as record:
+            noise = self._render_noise_batch(batch_size, latent_height, latent_width, noise_type, analysis_type,
+                                             intensity, grain, persistence, generators, dtype)
+            record["tensor_bytes"] = noise.nbytes
+        return noise
+
+    def _render_noise_batch(self, batch_size, latent_height, latent_width, noise_type, analysis_type,
+                            intensity, grain, persistence, generators=None, dtype=torch.float32):
+        # Random values are always drawn in float32, so a seed gives the same
+        # noise in every dtype up to rounding.
+        frame_shape = (4, latent_height, latent_width)
+        noise = torch.zeros((batch_size, 4, latent_height, latent_width), dtype=dtype, device="cpu")
         
         if noise_type == "gaussian":
             # Scale noise differently for spectral analysis
             if analysis_type in ["mel", "spectral"]:
-                base_noise = torch.randn((batch_size, 4, latent_height, latent_width))
-                freq_noise = torch.randn((batch_size, 4, latent_height, latent_width))
+                base_noise = random_frames(torch.randn, frame_shape, batch_size, generators).to(dtype)
+                freq_noise = random_frames(torch.randn, frame_shape, batch_size, generators).to(dtype)
                 noise = (base_noise + freq_noise * grain) * intensity * persistence
             else:
-                noise = torch.randn((batch_size, 4, latent_height, latent_width)) * intensity * persistence
+                noise = random_frames(torch.randn, frame_shape, batch_size, generators).to(dtype)
+                noise = noise * intensity * persistence
         
         elif noise_type == "salt_pepper":
             # Adjust threshold based on analysis type
             threshold = grain
             if analysis_type in ["onset", "segment"]:
-                threshold = min(grain * 1.5, 0.9)
+                threshold = grain.mul(1.5).clamp(max=0.9) if torch.is_tensor(grain) else min(grain * 1.5, 0.9)
             
-            mask = torch.rand((batch_size, 4, latent_height, latent_width)) < threshold
-            noise[mask] = intensity
-            noise[~mask] = -intensity
+            mask = random_frames(torch.rand, frame_shape, batch_size, generators) < threshold
+            if torch.is_tensor(intensity):
+                noise = torch.where(mask, intensity, -intensity)
+            else:
+                noise[mask] = intensity
+                noise[~mask] = -intensity
             noise *= persistence
             
         elif noise_type == "perlin":
@@ -91,23 +172,58 @@ class NoiseToLatentConverter:
             elif analysis_type in ["onset", "segment"]:
                 freq_multiplier = 0.5
                 
-            for i in range(batch_size):
-                for j in range(4):
-                    noise_values = self.rand_perlin_2d(
-                        (latent_height, latent_width),
-                        (1, 1)
-                    )
-                    noise_values = intensity * noise_values * persistence
-                    if analysis_type in ["mel", "spectral"]:
-                        # Add higher frequency detail for spectral analysis
-                        detail = self.rand_perlin_2d(
-                            (latent_height, latent_width),
-                            (2, 2)
-                        ) * 0.3
-                        noise_values += detail
-                    noise[i, j] = noise_values * freq_multiplier
-
-        return ({"samples": noise},)
+            shape = (latent_height, latent_width)
+            batch_shape = (batch_size, 4, latent_height, latent_width)
+            noise_values = self.rand_perlin_2d_batched(batch_size * 4, shape, (1, 1), generators=generators,
+                                                       dtype=dtype).view(batch_shape)
+            noise_values = intensity * noise_values * persistence
+            if analysis_type in ["mel", "spectral"]:
+                # Add higher frequency detail for spectral analysis
+                noise_values += self.rand_perlin_2d_batched(batch_size * 4, shape, (2, 2), generators=generators,
+                                                            dtype=dtype).view(batch_shape) * 0.3
+            noise = noise_values * freq_multiplier
+
+        # Per-frame (float32) params promote the result; scalars leave it in `dtype`
+        return noise.to(dtype)
+
+    def _render_range(self, width, height, noise_type, analysis_type, adjusted, seed, out, start, stop):
+        for first in range(start, stop, self.FRAME_CHUNK):
+            last = min(first + self.FRAME_CHUNK, stop)
+            out[first:last] = self._render_noise(last - first, height // 8, width // 8, noise_type, analysis_type,
+                                                 *self._chunk_params(adjusted, first, last),
+                                                 frame_generators(seed, range(first, last)), out.dtype)
+
+    def iter_latent_noise(self, noise_params, width, height, batch_size, noise_type, analysis_type,
+                          max_resident_frames=64, seed=None, dtype=torch.float32, start=0, stop=None):
+        """Yield ``(start, latents)`` chunks of at most ``max_resident_frames`` frames of ``start:stop``."""
+        adjusted = self._adjusted_params(noise_params, noise_type, analysis_type, batch_size)
+        chunk_size = max(1, max_resident_frames)
+        stop = batch_size if stop is None else min(stop, batch_size)
+        for first in range(start, stop, chunk_size):
+            last = min(first + chunk_size, stop)
+            yield first, self._render_noise(last - first, height // 8, width // 8, noise_type, analysis_type,
+                                            *self._chunk_params(adjusted, first, last),
+                                            frame_generators(seed, range(first, last)), dtype)
+
+    def generate_latent_noise(self, noise_params, width, height, batch_size, noise_type, analysis_type,
+                              seed=0, workers=1, compute_dtype="float32", memory_format="contiguous",
+                              profile=False):
+        self.profiler = StageProfiler("NoiseToLatentConverter", True if profile else None)
+        try:
+            adjusted = self._adjusted_params(noise_params, noise_type, analysis_type, batch_size)
+            task = partial(self._render_range, width, height, noise_type, analysis_type, adjusted, seed)
+            with self.profiler.stage("generate", batch_size) as record:
+                noise = render_sharded(task, batch_size, (4, height // 8, width // 8), workers,
+                                       COMPUTE_DTYPES[compute_dtype], MEMORY_FORMATS[memory_format])
+                record["tensor_bytes"] = noise.nbytes
+            if self.profiler.enabled:
+                note = None
+                if workers > 1:
+                    note = "(per-chunk stages ran in worker processes and are not included)"
+                print(self.profiler.finish(note))
+            return ({"samples": noise},)
+        finally:
+            self.profiler = NULL_PROFILER
 
 NODE_CLASS_MAPPINGS = {
     "NoiseToLatentConverter": NoiseToLatentConverter
@@ -0,0 +1,86 @@
+import hashlib
+from functools import partial
+
+import numpy as np
+
+from .AdvancedNoisePatterns import NOISE_TYPES as ADVANCED_NOISE_TYPES, AdvancedNoisePatterns
+from .NoiseToLatentConverter import NOISE_TYPES as CONVERTER_NOISE_TYPES, NoiseToLatentConverter
+from .latent_io import write_latent_chunks
+from .latent_sequence import SEQUENCE_SUFFIX, settings_signature, write_latent_sequence
+from .precision import COMPUTE_DTYPES
+
+
+def _digest(values):
+    return hashlib.sha256(np.asarray(values, dtype=np.float64).tobytes()).hexdigest()
+
+
+class StreamingLatentWriter:
+    @classmethod
+    def INPUT_TYPES(cls):
+        return {
+            "required": {
+                "noise_params": ("NOISE_PARAMS",),
+                "width": ("INT", {"default": 512, "min": 64, "max": 2048, "step": 8}),
+                "height": ("INT", {"default": 512, "min": 64, "max": 2048, "step": 8}),
+                "noise_type": (ADVANCED_NOISE_TYPES + CONVERTER_NOISE_TYPES,),
+                "analysis_type": ("ANALYSIS_TYPE",),
+                "output_path": ("STRING", {"multiline": False, "default": "output/audio_latents.npy"}),
+                "max_resident_frames": ("INT", {"default": 256, "min": 1, "max": 65536}),
+            },
+            "optional": {
+                "seed": ("INT", {"default": 0, "min": 0, "max": 0xffffffffffffffff}),
+                "engine": (["batched", "incremental"], {"default": "batched"}),
+                "compute_dtype": (list(COMPUTE_DTYPES), {"default": "float32"}),
+                "shard_frames": ("INT", {"default": 256, "min": 1, "max": 65536}),
+                "resolution_mode": (["full", "auto"], {"default": "full"}),
+            }
+        }
+
+    RETURN_TYPES = ("STRING", "TIMESTAMPS")
+    RETURN_NAMES = ("latent_path", "timestamps")
+    FUNCTION = "write_latents"
+    CATEGORY = "audio/noise"
+    OUTPUT_NODE = True
+
+    def write_latents(self, noise_params, width, height, noise_type, analysis_type, output_path, max_resident_frames,
+                      seed=0, engine="batched", compute_dtype="float32", shard_frames=256, resolution_mode="full"):
+        dtype = COMPUTE_DTYPES[compute_dtype]
+        if noise_type in ADVANCED_NOISE_TYPES:
+            # Advanced patterns ignore the windowed params
+            windowed = {}
+            generator = AdvancedNoisePatterns()
+            noise_params = generator._merge_noise_params(noise_params)
+            timestamps = noise_params["timestamps"]
+            render_range = partial(generator.iter_advanced_noise, noise_params, width, height, noise_type,
+                                   max_resident_frames, seed, engine == "incremental", dtype,
+                                   resolution_mode=resolution_mode)
+        else:
+            timestamps = noise_params.get("timestamps", [])
+            windowed = noise_params.get("windowed", {}).get(noise_type) or {}
+            render_range = partial(NoiseToLatentConverter().iter_latent_noise, noise_params, width, height,
+                                   max(1, len(timestamps)), noise_type, analysis_type, max_resident_frames, seed,
+                                   dtype)
+
+        frame_shape = (4, height // 8, width // 8)
+        if output_path.endswith(SEQUENCE_SUFFIX):
+            # Resumes an interrupted write of the same settings instead of starting over
+            signature = settings_signature({
+                "noise_type": noise_type, "analysis_type": analysis_type, "width": width, "height": height,
+                "seed": seed, "engine": engine, "resolution_mode": resolution_mode,
+                "params": noise_params.get(noise_type),
+                "windowed": {field: _digest(values) for field, values in windowed.items()},
+                "timestamps": _digest(timestamps),
+            })
+            write_latent_sequence(output_path, render_range, frame_shape, timestamps, dtype, shard_frames, signature)
+        else:
+            write_latent_chunks(render_range(), output_path, (max(1, len(timestamps)),) + frame_shape, dtype)
+        return (output_path, timestamps)
+
+
+NODE_CLASS_MAPPINGS = {
+    "StreamingLatentWriter": StreamingLatentWriter
+}
+
+NODE_DISPLAY_NAME_MAPPINGS = {
+    "StreamingLatentWriter": "Stream Audio Noise Latents to Disk"
+}
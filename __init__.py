@@ -5,7 +5,11 @@ node_list = [
     "librosa_analysis_node",
     "audio_noise_nodes",
     "AdvancedNoisePatterns",
-    "NoiseToLatentConverter"
+    "NoiseToLatentConverter",
+    "StreamingLatentWriter",
+    "frame_resampler",
+    "batch_analysis",
+    "latent_sequence"
 ]
 
 NODE_CLASS_MAPPINGS = {}
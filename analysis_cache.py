@@ -0,0 +1,116 @@
+import hashlib
+import json
+import os
+import time
+
+import numpy as np
+
+# Bump when the analysis output for a given file/type/window would change
+CACHE_VERSION = 1
+DEFAULT_CACHE_DIR = os.path.join(os.path.expanduser("~"), ".cache", "audiodriven-latent-tools")
+DEFAULT_MAX_MB = 512
+
+
+class AnalysisCache:
+    def __init__(self, directory=None, max_bytes=None):
+        self.directory = directory or os.environ.get("AUDIO_LATENT_CACHE_DIR", DEFAULT_CACHE_DIR)
+        if max_bytes is None:
+            max_bytes = int(float(os.environ.get("AUDIO_LATENT_CACHE_MAX_MB", DEFAULT_MAX_MB)) * 1024 * 1024)
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._index_path = os.path.join(self.directory, "index.json")
+        self._index = None
+
+    def _load_index(self):
+        if self._index is None:
+            try:
+                with open(self._index_path, "r", encoding="utf-8") as f:
+                    self._index = json.load(f)
+            except (OSError, ValueError):
+                self._index = {}
+            self._index.setdefault("files", {})
+            self._index.setdefault("entries", {})
+        return self._index
+
+    def _save_index(self):
+        os.makedirs(self.directory, exist_ok=True)
+        tmp_path = self._index_path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(self._index, f)
+        os.replace(tmp_path, self._index_path)
+
+    def file_digest(self, path):
+        # Reuse the stored content hash while size and mtime are unchanged
+        stat = os.stat(path)
+        files = self._load_index()["files"]
+        key = os.path.abspath(path)
+        known = files.get(key)
+        if known and known["size"] == stat.st_size and known["mtime_ns"] == stat.st_mtime_ns:
+            return known["sha256"]
+
+        digest = hashlib.sha256()
+        with open(path, "rb") as f:
+            for block in iter(lambda: f.read(1 << 20), b""):
+                digest.update(block)
+        files[key] = {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns, "sha256": digest.hexdigest()}
+        return files[key]["sha256"]
+
+    def _entry_name(self, path, analysis_type, window_size):
+        return f"{self.file_digest(path)}_{analysis_type}_{window_size}_v{CACHE_VERSION}.npz"
+
+    def get(self, path, analysis_type, window_size):
+        entries = self._load_index()["entries"]
+        name = self._entry_name(path, analysis_type, window_size)
+        entry_path = os.path.join(self.directory, name)
+        if name in entries and os.path.exists(entry_path):
+            try:
+                with np.load(entry_path) as data:
+                    result = {k: data[k] for k in data.files}
+            except (OSError, ValueError):
+                result = None
+            if result is not None:
+                self.hits += 1
+                entries[name]["last_access"] = time.time()
+                self._save_index()
+                return result
+
+        self.misses += 1
+        entries.pop(name, None)
+        self._save_index()
+        return None
+
+    def put(self, path, analysis_type, window_size, **arrays):
+        os.makedirs(self.directory, exist_ok=True)
+        entries = self._load_index()["entries"]
+        name = self._entry_name(path, analysis_type, window_size)
+        entry_path = os.path.join(self.directory, name)
+        np.savez_compressed(entry_path, **arrays)
+        entries[name] = {"size": os.path.getsize(entry_path), "last_access": time.time()}
+        self._evict()
+        self._save_index()
+
+    def _evict(self):
+        entries = self._index["entries"]
+        total = sum(e["size"] for e in entries.values())
+        for name in sorted(entries, key=lambda n: entries[n]["last_access"]):
+            if total <= self.max_bytes:
+                break
+            total -= entries.pop(name)["size"]
+            try:
+                os.remove(os.path.join(self.directory, name))
+            except OSError:
+                pass
+
+    def stats_text(self):
+        return f"hits={self.hits}, misses={self.misses}"
+
+
+_default_cache = None
+
+
+def get_analysis_cache():
+    global _default_cache
+    if _default_cache is None:
+        _default_cache = AnalysisCache()
+    return _default_cache
@@ -0,0 +1,258 @@
+from functools import cached_property
+
+import librosa
+import numpy as np
+
+from .profiling import NULL_PROFILER
+
+# librosa's defaults for stft/melspectrogram/onset_strength/beat_track
+N_FFT = 2048
+HOP_LENGTH = 512
+
+
+def _feature(compute):
+    # cached_property that reports its first computation as a profiler stage
+    def timed(self):
+        with self.profiler.stage(compute.__name__):
+            return compute(self)
+    timed.__name__ = compute.__name__
+    return cached_property(timed)
+
+
+class AudioFeatures:
+    """Decoded signal plus lazily computed, shared spectral features.
+
+    Each feature is computed at most once per instance, so every analysis
+    type run against the same file and window size indexes into the same
+    arrays instead of recomputing them.
+    """
+
+    profiler = NULL_PROFILER
+
+    def __init__(self, y, sr):
+        self.y = y
+        self.sr = sr
+        self._rms = {}
+
+    @classmethod
+    def from_file(cls, audio_file, profiler=NULL_PROFILER):
+        with profiler.stage("decode") as record:
+            y, sr = librosa.load(audio_file, sr=None)
+            record["tensor_bytes"] = y.nbytes
+        features = cls(y, sr)
+        features.profiler = profiler
+        return features
+
+    @_feature
+    def duration(self):
+        return librosa.get_duration(y=self.y, sr=self.sr)
+
+    @_feature
+    def stft_magnitude(self):
+        return np.abs(librosa.stft(self.y, n_fft=N_FFT, hop_length=HOP_LENGTH))
+
+    @_feature
+    def mel_power(self):
+        return librosa.feature.melspectrogram(S=self.stft_magnitude ** 2, sr=self.sr)
+
+    @_feature
+    def mel_mean(self):
+        return np.mean(self.mel_power, axis=0)
+
+    @_feature
+    def mel_db(self):
+        return librosa.power_to_db(self.mel_power)
+
+    @_feature
+    def onset_envelope(self):
+        return librosa.onset.onset_strength(S=self.mel_db, sr=self.sr, hop_length=HOP_LENGTH)
+
+    @_feature
+    def onset_envelope_median(self):
+        # beat_track aggregates onset strength with a median rather than a mean
+        return librosa.onset.onset_strength(S=self.mel_db, sr=self.sr, hop_length=HOP_LENGTH, aggregate=np.median)
+
+    @_feature
+    def spectral_flux_envelope(self):
+        return librosa.onset.onset_strength(S=librosa.amplitude_to_db(self.stft_magnitude), sr=self.sr,
+                                            hop_length=HOP_LENGTH)
+
+    @_feature
+    def spectral_centroid(self):
+        return librosa.feature.spectral_centroid(S=self.stft_magnitude, sr=self.sr)[0]
+
+    def rms(self, frame_length, hop_length=HOP_LENGTH):
+        key = (frame_length, hop_length)
+        if key not in self._rms:
+            with self.profiler.stage("rms"):
+                self._rms[key] = librosa.feature.rms(y=self.y, frame_length=frame_length, hop_length=hop_length)[0]
+        return self._rms[key]
+
+
+class _Framer:
+    # Cuts a stream of sample blocks into frames of `frame_length` every
+    # `hop_length` samples, zero-padding both ends like librosa's center=True.
+    def __init__(self, frame_length, hop_length):
+        self.frame_length = frame_length
+        self.hop_length = hop_length
+        self._buffer = np.zeros(frame_length // 2, dtype=np.float32)
+
+    def push(self, samples):
+        buffer = np.concatenate([self._buffer, samples])
+        if len(buffer) < self.frame_length:
+            self._buffer = buffer
+            return np.zeros((0, self.frame_length), dtype=np.float32)
+        count = 1 + (len(buffer) - self.frame_length) // self.hop_length
+        frames = np.lib.stride_tricks.sliding_window_view(buffer, self.frame_length)[::self.hop_length][:count]
+        self._buffer = buffer[count * self.hop_length:]
+        return frames
+
+    def finish(self):
+        return self.push(np.zeros(self.frame_length // 2, dtype=np.float32))
+
+
+class StreamingAudioFeatures:
+    """Block-wise counterpart of AudioFeatures for files too long to decode at once.
+
+    The file is read in blocks of ``block_length`` STFT hops and every feature
+    is accumulated frame by frame, so memory is bounded by the block size
+    rather than the file length. Features whose dB scaling depends on the
+    global maximum (onset and spectral-flux envelopes) take a second pass.
+    """
+
+    def __init__(self, audio_file, window_size=512, block_length=1024, profiler=NULL_PROFILER):
+        import soundfile as sf
+
+        self.profiler = profiler
+        info = sf.info(audio_file)
+        self.audio_file = audio_file
+        self.sr = info.samplerate
+        self.duration = info.frames / info.samplerate
+        self.block_length = block_length
+        self._rms_keys = {(window_size, HOP_LENGTH), (window_size, window_size // 4)}
+        self._rms = {}
+        self._spectral = None
+        self._onsets = None
+        self._window = librosa.filters.get_window("hann", N_FFT, fftbins=True).astype(np.float32)
+        self._mel_basis = librosa.filters.mel(sr=self.sr, n_fft=N_FFT)
+        self._frequencies = librosa.fft_frequencies(sr=self.sr, n_fft=N_FFT)
+
+    def _blocks(self):
+        import soundfile as sf
+
+        for block in sf.blocks(self.audio_file, blocksize=self.block_length * HOP_LENGTH,
+                               dtype="float32", always_2d=True):
+            # Downmix the same way librosa.load(mono=True) does
+            yield np.mean(block, axis=1)
+
+    def _framed(self, framers):
+        # Yields, per block, the new frames of every framer
+        for block in self._blocks():
+            yield [framer.push(block) for framer in framers]
+        yield [framer.finish() for framer in framers]
+
+    def _magnitude(self, frames):
+        return np.abs(np.fft.rfft(frames * self._window, axis=1)).T.astype(np.float32)
+
+    def _spectral_pass(self):
+        rms_keys = sorted(self._rms_keys)
+        framers = [_Framer(N_FFT, HOP_LENGTH)] + [_Framer(*key) for key in rms_keys]
+        rms = {key: [] for key in rms_keys}
+        mel_mean, centroid = [], []
+        mel_max, power_max = 0.0, 0.0
+
+        for stft_frames, *rms_frames in self._framed(framers):
+            for key, frames in zip(rms_keys, rms_frames):
+                rms[key].append(np.sqrt(np.mean(frames ** 2, axis=1)))
+            if len(stft_frames) == 0:
+                continue
+            magnitude = self._magnitude(stft_frames)
+            power = magnitude ** 2
+            mel = self._mel_basis @ power
+            mel_mean.append(np.mean(mel, axis=0))
+            length = np.sum(magnitude, axis=0)
+            length[length < np.finfo(magnitude.dtype).tiny] = 1.0
+            centroid.append(np.sum(self._frequencies[:, None] * magnitude, axis=0) / length)
+            mel_max = max(mel_max, float(mel.max()))
+            power_max = max(power_max, float(power.max()))
+
+        self._rms.update({key: np.concatenate(values) for key, values in rms.items()})
+        self._spectral = {
+            "mel_mean": np.concatenate(mel_mean),
+            "spectral_centroid": np.concatenate(centroid),
+            "mel_floor": librosa.power_to_db(np.float32(mel_max), top_db=None) - 80.0,
+            "power_floor": librosa.power_to_db(np.float32(power_max), amin=1e-10, top_db=None) - 80.0,
+        }
+
+    def _spectral_features(self):
+        if self._spectral is None:
+            with self.profiler.stage("spectral_pass"):
+                self._spectral_pass()
+        return self._spectral
+
+    def _onset_pass(self):
+        spectral = self._spectral_features()
+        mean_env, median_env, flux_env = [], [], []
+        previous = None
+
+        for (stft_frames,) in self._framed([_Framer(N_FFT, HOP_LENGTH)]):
+            if len(stft_frames) == 0:
+                continue
+            magnitude = self._magnitude(stft_frames)
+            mel_db = np.maximum(librosa.power_to_db(self._mel_basis @ magnitude ** 2, top_db=None),
+                                spectral["mel_floor"])
+            power_db = np.maximum(librosa.power_to_db(magnitude ** 2, amin=1e-10, top_db=None),
+                                  spectral["power_floor"])
+            if previous is not None:
+                mel_db = np.concatenate([previous[0], mel_db], axis=1)
+                power_db = np.concatenate([previous[1], power_db], axis=1)
+            previous = (mel_db[:, -1:], power_db[:, -1:])
+
+            mel_rise = np.maximum(0.0, mel_db[:, 1:] - mel_db[:, :-1])
+            mean_env.append(np.mean(mel_rise, axis=0))
+            median_env.append(np.median(mel_rise, axis=0))
+            flux_env.append(np.mean(np.maximum(0.0, power_db[:, 1:] - power_db[:, :-1]), axis=0))
+
+        # Same lag + centering offset and trim as librosa.onset.onset_strength
+        frames = len(spectral["mel_mean"])
+        pad_width = 1 + N_FFT // (2 * HOP_LENGTH)
+        finish = lambda env: np.pad(np.concatenate(env), (pad_width, 0))[:frames]
+        self._onsets = {
+            "onset_envelope": finish(mean_env),
+            "onset_envelope_median": finish(median_env),
+            "spectral_flux_envelope": finish(flux_env),
+        }
+
+    def _onset_features(self):
+        if self._onsets is None:
+            with self.profiler.stage("onset_pass"):
+                self._onset_pass()
+        return self._onsets
+
+    @property
+    def mel_mean(self):
+        return self._spectral_features()["mel_mean"]
+
+    @property
+    def spectral_centroid(self):
+        return self._spectral_features()["spectral_centroid"]
+
+    @property
+    def onset_envelope(self):
+        return self._onset_features()["onset_envelope"]
+
+    @property
+    def onset_envelope_median(self):
+        return self._onset_features()["onset_envelope_median"]
+
+    @property
+    def spectral_flux_envelope(self):
+        return self._onset_features()["spectral_flux_envelope"]
+
+    def rms(self, frame_length, hop_length=HOP_LENGTH):
+        key = (frame_length, hop_length)
+        if key not in self._rms:
+            self._rms_keys.add(key)
+            with self.profiler.stage("spectral_pass"):
+                self._spectral_pass()
+        return self._rms[key]
@@ -2,6 +2,8 @@ import numpy as np
 from typing import Dict, List, Tuple
 from dataclasses import dataclass
 
+from .profiling import StageProfiler
+
 @dataclass
 class NoiseParams:
     intensity: float
@@ -9,6 +11,45 @@ class NoiseParams:
     persistence: float
     distribution: str
 
+# z-score of the 90th percentile of a normal distribution
+Z_P90 = 1.2816
+
+
+def _window_bounds(timestamps, window_seconds):
+    # [lo, hi) index range of the samples within +-window/2 of each timestamp
+    half = window_seconds / 2
+    lo = np.searchsorted(timestamps, timestamps - half, "left")
+    hi = np.searchsorted(timestamps, timestamps + half, "right")
+    return lo, hi
+
+
+def _rolling_mean(values, lo, hi):
+    cumulative = np.concatenate([[0.0], np.cumsum(values)])
+    return (cumulative[hi] - cumulative[lo]) / np.maximum(hi - lo, 1)
+
+
+def _rolling_std(values, lo, hi):
+    # Centered on the global mean first so the cumulative sums stay well conditioned
+    centered = values - values.mean()
+    mean = _rolling_mean(centered, lo, hi)
+    return np.sqrt(np.maximum(_rolling_mean(centered ** 2, lo, hi) - mean ** 2, 0.0))
+
+
+def _rolling_max(values, lo, hi):
+    # Sparse table: level k holds the max of every 2**k-long run, so any
+    # [lo, hi) range is the max of two overlapping runs
+    k = np.floor(np.log2(np.maximum(hi - lo, 1))).astype(np.int64)
+    out = np.empty(len(lo))
+    row = values
+    for level in range(int(k.max()) + 1):
+        if level:
+            step = 2 ** (level - 1)
+            row = np.maximum(row[:-step], row[step:])
+        at = k == level
+        out[at] = np.maximum(row[lo[at]], row[hi[at] - 2 ** level])
+    return out
+
+
 class AudioNoiseMapper:
     @classmethod
     def INPUT_TYPES(cls):
@@ -17,6 +58,11 @@ class AudioNoiseMapper:
                 "energy_levels": ("AUDIO_ENERGY",),
                 "timestamps": ("TIMESTAMPS",),
                 "analysis_type": ("ANALYSIS_TYPE",),
+            },
+            "optional": {
+                "mode": (["global", "windowed"], {"default": "global"}),
+                "window_seconds": ("FLOAT", {"default": 2.0, "min": 0.05, "max": 60.0, "step": 0.05}),
+                "profile": ("BOOLEAN", {"default": False}),
             }
         }
     
@@ -41,10 +87,53 @@ class AudioNoiseMapper:
             "beat": {"scale": 1.8, "smoothing": 0.2}
         }
     
+    def _windowed_params(self, energy_array, timestamps, median, intensity_scale, smoothing, window_seconds):
+        # Per-timestamp versions of the global statistics, each O(N) cumulative
+        # sums (plus one O(N log N) max table) over a centered time window.
+        # The rolling 90th percentile is approximated as mean + Z_P90 * std,
+        # clipped to the window max, and salt & pepper grain is the share of
+        # the window above the track median.
+        times = np.asarray(timestamps, dtype=np.float64)
+        if len(times) != len(energy_array):
+            raise ValueError("Windowed mode needs one timestamp per energy value")
+        if np.any(np.diff(times) < 0):
+            raise ValueError("Windowed mode needs sorted timestamps")
+
+        lo, hi = _window_bounds(times, window_seconds)
+        mean = _rolling_mean(energy_array, lo, hi)
+        std = _rolling_std(energy_array, lo, hi)
+        peak = _rolling_max(energy_array, lo, hi)
+        # diffs[j] is the step into sample j + 1, so sample i's window covers diffs[lo:hi - 1]
+        diffs = np.diff(energy_array)
+        diff_std = _rolling_std(diffs, lo, np.maximum(hi - 1, lo)) if len(diffs) else np.zeros_like(mean)
+        persistence = np.exp(-smoothing * diff_std)
+
+        return {
+            "gaussian": {
+                "intensity": (mean * intensity_scale * 3.0).tolist(),
+                "grain": (std * 5.0).tolist(),
+                "persistence": persistence.tolist(),
+            },
+            "salt_pepper": {
+                "intensity": (np.minimum(mean + Z_P90 * std, peak) * intensity_scale).tolist(),
+                "grain": _rolling_mean((energy_array > median).astype(np.float64), lo, hi).tolist(),
+                "persistence": persistence.tolist(),
+            },
+            "perlin": {
+                "intensity": (peak * intensity_scale * 4.0).tolist(),
+                "grain": (std * 10.0).tolist(),
+                "persistence": persistence.tolist(),
+            },
+        }
+
     def process_energy_to_noise(self, 
                               energy_levels: List[float],
                               timestamps: List[float],
-                              analysis_type: str) -> Tuple[Dict[str, NoiseParams], str]:
+                              analysis_type: str,
+                              mode: str = "global",
+                              window_seconds: float = 2.0,
+                              profile: bool = False) -> Tuple[Dict[str, NoiseParams], str]:
+        profiler = StageProfiler("AudioNoiseMapper", True if profile else None)
         try:
             if len(energy_levels) == 0 or len(timestamps) == 0:
                 raise ValueError("Empty energy levels or timestamps received")
@@ -55,25 +144,34 @@ class AudioNoiseMapper:
             # Calculate noise parameters based on analysis type
             intensity_scale = params["scale"]
             smoothing = params["smoothing"]
+
+            # Statistics shared by several noise types are computed once
+            with profiler.stage("global_stats", len(energy_array)):
+                mean = np.mean(energy_array)
+                std = np.std(energy_array)
+                median = np.median(energy_array)
+                persistence = float(np.exp(-smoothing * np.std(np.diff(energy_array))))
+                percentile_90 = np.percentile(energy_array, 90)
+                peak = np.max(energy_array)
             
             # Generate different noise distributions
             noise_params = {
                 "gaussian": {
-                    "intensity": float(np.mean(energy_array) * intensity_scale * 3.0),
-                    "grain": float(np.std(energy_array) * 5.0),
-                    "persistence": float(np.exp(-smoothing * np.std(np.diff(energy_array)))),
+                    "intensity": float(mean * intensity_scale * 3.0),
+                    "grain": float(std * 5.0),
+                    "persistence": persistence,
                     "distribution": "gaussian"
                 },
                 "salt_pepper": {
-                    "intensity": float(np.percentile(energy_array, 90) * intensity_scale),
-                    "grain": float(np.mean(energy_array > np.median(energy_array))),
-                    "persistence": float(np.exp(-smoothing * np.std(np.diff(energy_array)))),
+                    "intensity": float(percentile_90 * intensity_scale),
+                    "grain": float(np.mean(energy_array > median)),
+                    "persistence": persistence,
                     "distribution": "salt_pepper"
                 },
                 "perlin": {
-                    "intensity": float(np.max(energy_array) * intensity_scale * 4.0),
-                    "grain": float(np.std(energy_array) * 10.0),
-                    "persistence": float(np.exp(-smoothing * np.std(np.diff(energy_array)))),
+                    "intensity": float(peak * intensity_scale * 4.0),
+                    "grain": float(std * 10.0),
+                    "persistence": persistence,
                     "distribution": "perlin"
                 },
                 "timestamps": timestamps
@@ -82,9 +180,18 @@ class AudioNoiseMapper:
             debug_info = (
                 f"Analysis: {analysis_type}\n"
                 f"Scale: {intensity_scale:.2f}\n"
-                f"Mean Energy: {np.mean(energy_array):.3f}\n"
-                f"Energy Variance: {np.var(energy_array):.3f}"
+                f"Mean Energy: {mean:.3f}\n"
+                f"Energy Variance: {std ** 2:.3f}"
             )
+
+            if mode == "windowed":
+                # Scalars above stay the track-wide values; per-timestamp arrays sit alongside them
+                with profiler.stage("windowed_stats", len(energy_array)):
+                    noise_params["windowed"] = self._windowed_params(energy_array, timestamps, median,
+                                                                     intensity_scale, smoothing, window_seconds)
+                debug_info += f"\nWindow: {window_seconds:.2f}s"
+            if profiler.enabled:
+                debug_info += "\n" + profiler.finish()
             
             return (noise_params, debug_info)
             
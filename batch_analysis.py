@@ -0,0 +1,234 @@
+import glob
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from .analysis_cache import get_analysis_cache
+from .librosa_analysis_node import ANALYSIS_TYPES, LibrosaAnalysisNode
+from .parallel import process_context
+
+AUDIO_EXTENSIONS = (".wav", ".flac", ".mp3", ".ogg", ".m4a", ".aac", ".aiff", ".aif", ".opus", ".wma")
+
+
+def resolve_audio_files(pattern):
+    """Audio files in a directory, or matching a glob (``**`` recurses), sorted by path."""
+    pattern = os.path.expanduser(pattern.strip())
+    if os.path.isdir(pattern):
+        paths = [os.path.join(pattern, name) for name in os.listdir(pattern)]
+    else:
+        paths = glob.glob(pattern, recursive=True)
+    return sorted(p for p in paths if os.path.isfile(p) and p.lower().endswith(AUDIO_EXTENSIONS))
+
+
+def _warm_worker(analysis_type, window_size):
+    # Pay librosa's lazy submodule imports and numba JIT compilation once per
+    # worker, on two seconds of clicks, instead of on the first real file.
+    from .audio_features import AudioFeatures
+
+    sr = 22050
+    y = np.zeros(2 * sr, dtype=np.float32)
+    y[::sr // 4] = 1.0
+    LibrosaAnalysisNode()._compute_analysis(AudioFeatures(y, sr), analysis_type, window_size)
+
+
+def _analyze_file(job):
+    path, analysis_type, window_size, decode_mode = job
+    node = LibrosaAnalysisNode()
+    try:
+        features = node._load_features(path, window_size, decode_mode)
+        energy_levels, timestamps = node._compute_analysis(features, analysis_type, window_size)
+        return path, energy_levels, timestamps, float(features.duration), None
+    except Exception as e:
+        return path, None, None, None, f"{type(e).__name__}: {e}"
+
+
+def analyze_files(paths, analysis_type, window_size, workers=1, use_cache=True, decode_mode="full"):
+    """Analyze ``paths``, returning ``[(path, energy, timestamps, duration, error)]`` in input order.
+
+    Cache lookups and stores stay in this process; only misses go to the
+    pool, so workers never write to the shared cache index.
+    """
+    cache = get_analysis_cache() if use_cache else None
+    results = {}
+    jobs = []
+    for path in paths:
+        cached = cache.get(path, analysis_type, window_size) if cache else None
+        if cached is not None:
+            results[path] = (path, cached["energy"], cached["timestamps"], float(cached["duration"]), None)
+        else:
+            jobs.append((path, analysis_type, window_size, decode_mode))
+
+    # Decoding and analysis are CPU bound; extra workers beyond the cores only add warm-up
+    workers = max(1, min(int(workers), len(jobs), os.cpu_count() or 1))
+    if workers == 1:
+        analyzed = map(_analyze_file, jobs)
+        executor = None
+    else:
+        ctx = process_context()
+        warm_args = (analysis_type, window_size)
+        if ctx.get_start_method() == "fork":
+            # Forked workers inherit the imports and compiled functions, so warm up once here
+            _warm_worker(*warm_args)
+            executor = ProcessPoolExecutor(workers, mp_context=ctx)
+        else:
+            executor = ProcessPoolExecutor(workers, mp_context=ctx, initializer=_warm_worker, initargs=warm_args)
+        analyzed = executor.map(_analyze_file, jobs)
+    try:
+        for result in analyzed:
+            path, energy_levels, timestamps, duration, error = result
+            if cache and error is None:
+                cache.put(path, analysis_type, window_size,
+                          energy=energy_levels, timestamps=timestamps, duration=np.float64(duration))
+            results[path] = result
+    finally:
+        if executor is not None:
+            executor.shutdown()
+    return [results[path] for path in paths], cache
+
+
+def save_batch_analysis(path, analysis_type, window_size, results):
+    """Write analyzed files as one columnar ``.npz``.
+
+    Every file's energy and timestamps are concatenated into two flat arrays;
+    file ``i`` owns ``energy[offsets[i]:offsets[i + 1]]``.
+    """
+    analyzed = [r for r in results if r[4] is None]
+    lengths = [len(r[1]) for r in analyzed]
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    np.savez(
+        path,
+        names=np.array([r[0] for r in analyzed], dtype=str),
+        offsets=np.concatenate([[0], np.cumsum(lengths, dtype=np.int64)]).astype(np.int64),
+        energy=np.concatenate([r[1] for r in analyzed] or [[]]).astype(np.float32),
+        timestamps=np.concatenate([r[2] for r in analyzed] or [[]]).astype(np.float64),
+        durations=np.array([r[3] for r in analyzed], dtype=np.float64),
+        analysis_type=np.array(analysis_type),
+        window_size=np.array(window_size),
+    )
+    return path if path.endswith(".npz") else path + ".npz"
+
+
+class BatchAnalysis:
+    """Columnar batch analysis file, loaded once; ``file(i)`` slices one file's arrays."""
+
+    def __init__(self, path):
+        with np.load(path) as data:
+            self.names = [str(n) for n in data["names"]]
+            self.offsets = data["offsets"]
+            self.energy = data["energy"]
+            self.timestamps = data["timestamps"]
+            self.durations = data["durations"]
+            self.analysis_type = str(data["analysis_type"])
+            self.window_size = int(data["window_size"])
+
+    def __len__(self):
+        return len(self.names)
+
+    def index_of(self, name):
+        # Full path, file name, or file name without extension
+        for i, full in enumerate(self.names):
+            base = os.path.basename(full)
+            if name in (full, base, os.path.splitext(base)[0]):
+                return i
+        raise KeyError(f"{name!r} is not in this batch analysis")
+
+    def file(self, index):
+        lo, hi = self.offsets[index], self.offsets[index + 1]
+        return self.energy[lo:hi], self.timestamps[lo:hi]
+
+
+class BatchLibrosaAnalysisNode:
+    @classmethod
+    def INPUT_TYPES(cls):
+        return {
+            "required": {
+                "audio_files": ("STRING", {"multiline": False, "default": "path/to/album/*.wav"}),
+                "analysis_type": (ANALYSIS_TYPES, {"default": "default"}),
+                "window_size": ("INT", {"default": 512, "min": 128, "max": 2048, "step": 128}),
+                "output_path": ("STRING", {"multiline": False, "default": "output/batch_analysis.npz"}),
+            },
+            "optional": {
+                "workers": ("INT", {"default": 4, "min": 1, "max": 64}),
+                "use_cache": ("BOOLEAN", {"default": True}),
+                "decode_mode": (["full", "streaming"], {"default": "full"}),
+            },
+        }
+
+    RETURN_TYPES = ("STRING", "STRING")
+    RETURN_NAMES = ("batch_path", "analysis_text")
+    FUNCTION = "analyze_batch"
+    CATEGORY = "Audio Processing"
+    OUTPUT_NODE = True
+
+    def analyze_batch(self, audio_files, analysis_type, window_size, output_path, workers=4, use_cache=True,
+                      decode_mode="full"):
+        paths = resolve_audio_files(audio_files)
+        if not paths:
+            return ("", f"Error: no audio files match {audio_files!r}")
+
+        results, cache = analyze_files(paths, analysis_type, window_size, workers, use_cache, decode_mode)
+        batch_path = save_batch_analysis(output_path, analysis_type, window_size, results)
+
+        failed = [(path, error) for path, _, _, _, error in results if error is not None]
+        analysis_text = (
+            f"Analysis Type: {analysis_type}\n"
+            f"Files: {len(results) - len(failed)} analyzed, {len(failed)} failed\n"
+            f"Duration: {sum(r[3] for r in results if r[4] is None):.2f} seconds\n"
+            f"Measurements: {sum(len(r[1]) for r in results if r[4] is None)}\n"
+            f"Window Size: {window_size}"
+        )
+        if cache:
+            analysis_text += f"\nCache: {cache.stats_text()}"
+        for path, error in failed:
+            analysis_text += f"\nFailed: {os.path.basename(path)}: {error}"
+        return (batch_path, analysis_text)
+
+
+class LoadBatchAnalysisNode:
+    @classmethod
+    def INPUT_TYPES(cls):
+        return {
+            "required": {
+                "batch_path": ("STRING", {"multiline": False, "default": "output/batch_analysis.npz"}),
+                "index": ("INT", {"default": 0, "min": 0, "max": 100000}),
+            },
+            "optional": {
+                "name": ("STRING", {"multiline": False, "default": ""}),
+            },
+        }
+
+    RETURN_TYPES = ("AUDIO_ENERGY", "TIMESTAMPS", "STRING", "ANALYSIS_TYPE")
+    RETURN_NAMES = ("energy_levels", "timestamps", "analysis_text", "analysis_type")
+    FUNCTION = "load_analysis"
+    CATEGORY = "Audio Processing"
+
+    def load_analysis(self, batch_path, index, name=""):
+        batch = BatchAnalysis(batch_path)
+        if name:
+            index = batch.index_of(name)
+        if not 0 <= index < len(batch):
+            raise IndexError(f"index {index} is out of range for {len(batch)} files in {batch_path}")
+        energy_levels, timestamps = batch.file(index)
+
+        analysis_text = (
+            f"File: {os.path.basename(batch.names[index])} ({index + 1} of {len(batch)})\n"
+            f"Analysis Type: {batch.analysis_type}\n"
+            f"Duration: {batch.durations[index]:.2f} seconds\n"
+            f"Measurements: {len(energy_levels)}\n"
+            f"Window Size: {batch.window_size}"
+        )
+        return (energy_levels.tolist(), timestamps.tolist(), analysis_text, batch.analysis_type)
+
+
+NODE_CLASS_MAPPINGS = {
+    "BatchLibrosaAnalysisNode": BatchLibrosaAnalysisNode,
+    "LoadBatchAnalysisNode": LoadBatchAnalysisNode,
+}
+
+NODE_DISPLAY_NAME_MAPPINGS = {
+    "BatchLibrosaAnalysisNode": "Batch Librosa Audio Analysis",
+    "LoadBatchAnalysisNode": "Load Batch Audio Analysis",
+}
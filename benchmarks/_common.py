@@ -0,0 +1,38 @@
+import importlib.util
+import os
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def load_package(name="audiodriven_latent_tools"):
+    # The node package uses relative imports, so load it as a package
+    if name in sys.modules:
+        return sys.modules[name]
+    spec = importlib.util.spec_from_file_location(
+        name, os.path.join(ROOT, "__init__.py"), submodule_search_locations=[ROOT])
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    spec.loader.exec_module(module)
+    return module
+
+
+def timed(fn, repeat):
+    """Best wall time of ``repeat`` calls after a warm-up call, and the last result."""
+    fn()
+    best, out = float("inf"), None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        out = fn()
+        best = min(best, time.perf_counter() - start)
+    return best, out
+
+
+def error_stats(out, reference):
+    """Max, mean and 99th percentile absolute error of ``out`` against ``reference``."""
+    # Saturated fbm frames are NaN whatever the dtype or resolution; compare the rest
+    error = (out.float() - reference.float()).abs().nan_to_num()
+    # quantile() is limited in input size; a strided sample is enough for p99
+    p99 = error.flatten()[::max(1, error.numel() // 1_000_000)].quantile(0.99).item()
+    return error.max().item(), error.mean().item(), p99
@@ -0,0 +1,61 @@
+"""Compare the brute-force and tile-pruned cellular noise generators.
+
+Run from the repository root:
+
+    python benchmarks/bench_cellular.py --frames 32 --sizes 64 128 256
+"""
+import argparse
+import time
+
+import torch
+
+from _common import load_package
+
+
+def brute_force(shape, points, counts):
+    out = []
+    for frame, count in zip(points, counts):
+        p = frame[:count]
+        x = torch.arange(shape[0]).reshape(-1, 1).repeat(1, shape[1]).reshape(-1, 1)
+        y = torch.arange(shape[1]).reshape(1, -1).repeat(shape[0], 1).reshape(-1, 1)
+        d1 = torch.min(torch.sqrt((x - p[:, 0]) ** 2 + (y - p[:, 1]) ** 2), dim=1)[0].reshape(shape)
+        d2 = torch.min(torch.sqrt((x - p[:, 0] * 1.5) ** 2 + (y - p[:, 1] * 0.8) ** 2), dim=1)[0].reshape(shape)
+        out.append(torch.sin(d1 * 0.2) * torch.cos(d2 * 0.15))
+    return torch.stack(out)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--frames", type=int, default=32)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[64, 128, 256])
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    package = load_package()
+    node = package.AdvancedNoisePatterns.AdvancedNoisePatterns()
+    generator = torch.Generator().manual_seed(args.seed)
+
+    print(f"{'latent':>9} {'brute ms/frame':>15} {'pruned ms/frame':>16} {'speedup':>8} {'exact':>6}")
+    for size in args.sizes:
+        shape = (size, size)
+        # Same point counts and spread as generate_advanced_noise produces
+        counts = torch.randint(3, 454, (args.frames,), generator=generator)
+        chaos = 0.5 + torch.rand(args.frames, generator=generator) * 2
+        max_points = int(counts.max())
+        points = torch.rand(args.frames, max_points, 2, generator=generator) * torch.tensor(shape) * chaos.view(-1, 1, 1)
+        points[torch.arange(max_points).view(1, -1) >= counts.view(-1, 1)] = 1e6
+
+        start = time.perf_counter()
+        expected = brute_force(shape, points, counts.tolist())
+        brute = time.perf_counter() - start
+
+        start = time.perf_counter()
+        result = node.cellular_from_points(shape, points)
+        pruned = time.perf_counter() - start
+
+        print(f"{size:>4}x{size:<4} {brute / args.frames * 1e3:>15.2f} {pruned / args.frames * 1e3:>16.2f} "
+              f"{brute / pruned:>7.1f}x {str(torch.equal(expected, result)):>6}")
+
+
+if __name__ == "__main__":
+    main()
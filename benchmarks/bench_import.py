@@ -0,0 +1,58 @@
+"""Time registering the nodes the way ComfyUI does at server start.
+
+Each run imports the package in a fresh interpreter, after torch (which
+ComfyUI has always loaded by then), and reports the median wall time and
+which heavy audio libraries were pulled in. Pass another checkout's path
+to compare against it:
+
+    python benchmarks/bench_import.py
+    python benchmarks/bench_import.py /path/to/other/checkout
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+HEAVY_MODULES = ["librosa", "numba", "scipy", "sklearn", "soundfile"]
+
+PROBE = """
+import importlib.util, json, sys, time
+import torch
+root = sys.argv[1]
+start = time.perf_counter()
+spec = importlib.util.spec_from_file_location("audiodriven_latent_tools", root + "/__init__.py",
+                                              submodule_search_locations=[root])
+module = importlib.util.module_from_spec(spec)
+sys.modules[spec.name] = module
+spec.loader.exec_module(module)
+elapsed = time.perf_counter() - start
+print(json.dumps({"seconds": elapsed, "nodes": len(module.NODE_CLASS_MAPPINGS),
+                  "loaded": [m for m in json.loads(sys.argv[2]) if m in sys.modules]}))
+"""
+
+
+def measure(root, runs):
+    samples = []
+    for _ in range(runs):
+        out = subprocess.run([sys.executable, "-c", PROBE, root, json.dumps(HEAVY_MODULES)],
+                             capture_output=True, text=True, check=True)
+        samples.append(json.loads(out.stdout.strip().splitlines()[-1]))
+    return statistics.median(s["seconds"] for s in samples), samples[-1]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("roots", nargs="*", default=[os.path.dirname(os.path.dirname(os.path.abspath(__file__)))])
+    parser.add_argument("--runs", type=int, default=7)
+    args = parser.parse_args()
+
+    for root in args.roots:
+        seconds, sample = measure(os.path.abspath(root), args.runs)
+        print(f"{root}: {seconds * 1000:.0f} ms median over {args.runs} runs, {sample['nodes']} nodes, "
+              f"heavy modules loaded: {', '.join(sample['loaded']) or 'none'}")
+
+
+if __name__ == "__main__":
+    main()
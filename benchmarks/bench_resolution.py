@@ -0,0 +1,65 @@
+"""Quality versus speed of resolution_mode "auto" against "full".
+
+For each pattern, intensity and COARSE_SAMPLES setting, renders the same
+frames both ways and reports the render time, the share of frames whose
+smooth components went to a coarse grid, and the error of the latents
+against full resolution. Run from the repository root:
+
+    python benchmarks/bench_resolution.py --resolution 2048 --frames 120
+"""
+import argparse
+
+import numpy as np
+
+from _common import error_stats, load_package, timed
+
+NOISE_TYPES = ["simplex", "wave", "fbm"]
+# Highest frequency, in cycles per frame, that "auto" sizes each pattern's coarse grid by
+MAX_FREQUENCY = {
+    "simplex": lambda f: 2 * (1 + f["energy_factor"] * 30),
+    "wave": lambda f: 1.7 * (0.3 + f["energy_factor"] * 12),
+    # Lowest octave only; higher octaves go coarse less often
+    "fbm": lambda f: 2 * f["chaos"],
+}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--resolution", type=int, default=2048)
+    parser.add_argument("--frames", type=int, default=120)
+    parser.add_argument("--seconds", type=float, default=60.0)
+    parser.add_argument("--intensities", type=float, nargs="+", default=[1.0, 0.05])
+    parser.add_argument("--samples", type=int, nargs="+", default=[8, 16, 32])
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    package = load_package()
+    generator = package.AdvancedNoisePatterns.AdvancedNoisePatterns()
+    default_samples = generator.COARSE_SAMPLES
+    size = args.resolution
+    shape = (size // 8, size // 8)
+    timestamps = list(np.linspace(0.0, args.seconds, args.frames))
+
+    print(f"{'pattern':<12} {'intensity':>9} {'samples':>7} {'full s':>7} {'auto s':>7} {'speedup':>7} "
+          f"{'coarse':>7} {'max err':>8} {'mean err':>9} {'p99 err':>8}")
+    for noise_type in NOISE_TYPES:
+        for intensity in args.intensities:
+            params = {"timestamps": list(timestamps), noise_type: {"intensity": intensity}}
+            render = lambda mode: generator.generate_advanced_noise(
+                dict(params), size, size, noise_type, "mel", seed=0, resolution_mode=mode)[0]["samples"]
+            generator.COARSE_SAMPLES = default_samples
+            full_seconds, full = timed(lambda: render("full"), args.repeat)
+            frames = generator._frame_params(timestamps, intensity)
+            for samples in args.samples:
+                generator.COARSE_SAMPLES = samples
+                auto_seconds, auto = timed(lambda: render("auto"), args.repeat)
+                coarse = (generator._coarse_factors(shape, MAX_FREQUENCY[noise_type](frames), "auto") > 1).mean()
+                max_error, mean_error, p99 = error_stats(auto, full)
+                print(f"{noise_type:<12} {intensity:>9.2f} {samples:>7} {full_seconds:>7.3f} {auto_seconds:>7.3f} "
+                      f"{full_seconds / auto_seconds:>6.2f}x {coarse:>7.0%} {max_error:>8.4f} "
+                      f"{mean_error:>9.5f} {p99:>8.4f}", flush=True)
+    generator.COARSE_SAMPLES = default_samples
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,59 @@
+"""Accuracy and speed of reduced-precision latents versus float32.
+
+For every noise type of both noise nodes, renders the same seeded batch in
+float32, bfloat16 and float16 and reports the error against float32, the
+render time and the output size. Run from the repository root:
+
+    python benchmarks/precision_report.py --resolution 1024 --frames 64
+"""
+import argparse
+
+import numpy as np
+
+from _common import error_stats, load_package, timed
+
+DTYPES = ["float32", "bfloat16", "float16"]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--resolution", type=int, default=512)
+    parser.add_argument("--frames", type=int, default=64)
+    parser.add_argument("--analysis-type", default="mel")
+    parser.add_argument("--memory-format", default="contiguous", choices=["contiguous", "channels_last"])
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    package = load_package()
+    advanced = package.AdvancedNoisePatterns.AdvancedNoisePatterns()
+    converter = package.NoiseToLatentConverter.NoiseToLatentConverter()
+    size = args.resolution
+    timestamps = list(np.linspace(0.0, args.frames / 24, args.frames))
+    converter_params = {t: {"intensity": 1.0, "grain": 0.4, "persistence": 0.8} for t in package.NoiseToLatentConverter.NOISE_TYPES}
+
+    cases = []
+    for noise_type in package.AdvancedNoisePatterns.NOISE_TYPES:
+        cases.append((f"advanced/{noise_type}", lambda dtype, noise_type=noise_type:
+                      advanced.generate_advanced_noise({"timestamps": list(timestamps)}, size, size, noise_type,
+                                                       args.analysis_type, seed=0, compute_dtype=dtype,
+                                                       memory_format=args.memory_format)[0]["samples"]))
+    for noise_type in package.NoiseToLatentConverter.NOISE_TYPES:
+        cases.append((f"converter/{noise_type}", lambda dtype, noise_type=noise_type:
+                      converter.generate_latent_noise(converter_params, size, size, args.frames, noise_type,
+                                                      args.analysis_type, seed=0, compute_dtype=dtype,
+                                                      memory_format=args.memory_format)[0]["samples"]))
+
+    print(f"{'case':<24} {'dtype':<9} {'seconds':>8} {'MB':>7} {'max err':>9} {'mean err':>9} {'p99 err':>9}")
+    for name, render in cases:
+        reference = None
+        for dtype in DTYPES:
+            seconds, out = timed(lambda: render(dtype), args.repeat)
+            if reference is None:
+                reference = out
+            max_error, mean_error, p99 = error_stats(out, reference)
+            print(f"{name:<24} {dtype:<9} {seconds:>8.3f} {out.numel() * out.element_size() / 2**20:>7.1f} "
+                  f"{max_error:>9.4f} {mean_error:>9.5f} {p99:>9.4f}", flush=True)
+
+
+if __name__ == "__main__":
+    main()
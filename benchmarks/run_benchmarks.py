@@ -0,0 +1,176 @@
+"""Benchmark every node across analysis types, noise types and resolutions.
+
+Synthetic audio (a sine sweep with a click track) is generated locally, so
+runs are reproducible without any sample files. Each case is timed after a
+warm-up call, in a forked process where available so peak RSS is per case.
+
+Run from the repository root:
+
+    python benchmarks/run_benchmarks.py --save benchmarks/baselines/local.json
+    python benchmarks/run_benchmarks.py --compare benchmarks/baselines/local.json
+"""
+import argparse
+import json
+import multiprocessing
+import os
+import platform
+import sys
+import tempfile
+
+import numpy as np
+
+from _common import load_package, timed
+
+
+def synthetic_audio(path, duration, sr=22050):
+    import soundfile as sf
+
+    t = np.arange(int(duration * sr)) / sr
+    # Exponential sweep 60 Hz -> 4 kHz with a slow amplitude swell
+    sweep = np.sin(2 * np.pi * 60 * duration / np.log(4000 / 60) * (np.exp(t / duration * np.log(4000 / 60)) - 1))
+    y = 0.3 * sweep * (0.6 + 0.4 * np.sin(2 * np.pi * 0.25 * t))
+    # 120 bpm click track with accented downbeats
+    for i, start in enumerate(np.arange(0, duration, 0.5)):
+        n = int(start * sr)
+        y[n:n + 256] += (0.9 if i % 4 == 0 else 0.5) * np.exp(-np.arange(len(y[n:n + 256])) / 40.0)
+    sf.write(path, y.astype(np.float32), sr)
+    return path
+
+
+def _run_case(case, repeat, queue):
+    # None where the platform has no peak RSS (Windows)
+    peak_rss_mb = load_package().profiling._peak_rss_mb
+    rss_start = peak_rss_mb()
+    # The warm-up call pays numba JIT, caches and allocator growth
+    seconds, frames = timed(case["fn"], repeat)
+    rss_end = peak_rss_mb()
+    queue.put({"seconds": seconds, "frames": frames, "peak_rss_mb": rss_end,
+               "rss_delta_mb": None if rss_end is None else rss_end - rss_start})
+
+
+def run_case(case, repeat):
+    if "fork" in multiprocessing.get_all_start_methods():
+        ctx = multiprocessing.get_context("fork")
+        queue = ctx.Queue()
+        process = ctx.Process(target=_run_case, args=(case, repeat, queue))
+        process.start()
+        result = queue.get()
+        process.join()
+    else:
+        queue = multiprocessing.Queue()
+        _run_case(case, repeat, queue)
+        result = queue.get()
+    result["frames_per_sec"] = result["frames"] / result["seconds"] if result["seconds"] > 0 else None
+    return result
+
+
+def build_cases(package, audio_files, resolutions, frames):
+    analysis = package.librosa_analysis_node.LibrosaAnalysisNode()
+    mapper = package.audio_noise_nodes.AudioNoiseMapper()
+    converter = package.NoiseToLatentConverter.NoiseToLatentConverter()
+    advanced = package.AdvancedNoisePatterns.AdvancedNoisePatterns()
+    cases = []
+
+    for duration, path in audio_files.items():
+        for analysis_type in package.librosa_analysis_node.ANALYSIS_TYPES:
+            def analyze(path=path, analysis_type=analysis_type):
+                return len(analysis.analyze_audio(path, analysis_type, 512, use_cache=False)[0])
+            cases.append({"name": f"analyze_audio/{analysis_type}/{duration}s", "fn": analyze})
+
+    # The mapper and generators consume the longest file's analyses
+    path = audio_files[max(audio_files)]
+    for analysis_type in package.librosa_analysis_node.ANALYSIS_TYPES:
+        energy, timestamps, _, _ = analysis.analyze_audio(path, analysis_type, 512, use_cache=False)
+
+        def map_energy(energy=energy, timestamps=timestamps, analysis_type=analysis_type):
+            mapper.process_energy_to_noise(energy, timestamps, analysis_type)
+            return len(energy)
+        cases.append({"name": f"process_energy_to_noise/{analysis_type}/{max(audio_files)}s", "fn": map_energy})
+
+    energy, timestamps, _, _ = analysis.analyze_audio(path, "onset", 512, use_cache=False)
+    noise_params, _ = mapper.process_energy_to_noise(energy, timestamps, "onset")
+    advanced_params = {"timestamps": list(np.linspace(0.0, max(audio_files), frames))}
+
+    for resolution in resolutions:
+        for noise_type in package.NoiseToLatentConverter.NOISE_TYPES:
+            def convert(noise_type=noise_type, resolution=resolution):
+                converter.generate_latent_noise(noise_params, resolution, resolution, 64, noise_type, "mel")
+                return 64
+            cases.append({"name": f"generate_latent_noise/{noise_type}/{resolution}px", "fn": convert})
+
+        for noise_type in package.AdvancedNoisePatterns.NOISE_TYPES:
+            def generate(noise_type=noise_type, resolution=resolution):
+                advanced.generate_advanced_noise(dict(advanced_params), resolution, resolution, noise_type, "default")
+                return frames
+            cases.append({"name": f"generate_advanced_noise/{noise_type}/{resolution}px", "fn": generate})
+
+    return cases
+
+
+def compare(results, baseline_path, tolerance):
+    with open(baseline_path, "r", encoding="utf-8") as f:
+        baseline = json.load(f)["results"]
+    regressions = []
+    print(f"\n{'case':<48} {'baseline s':>11} {'current s':>10} {'ratio':>7}")
+    for name, result in results.items():
+        if name not in baseline:
+            continue
+        ratio = result["seconds"] / baseline[name]["seconds"]
+        flag = "  REGRESSION" if ratio > tolerance else ""
+        print(f"{name:<48} {baseline[name]['seconds']:>11.4f} {result['seconds']:>10.4f} {ratio:>6.2f}x{flag}")
+        if flag:
+            regressions.append(name)
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--durations", type=float, nargs="+", default=[3, 12, 90])
+    parser.add_argument("--resolutions", type=int, nargs="+", default=[512, 1024])
+    parser.add_argument("--frames", type=int, default=64, help="timestamps fed to AdvancedNoisePatterns")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--filter", default="", help="only run cases whose name contains this")
+    parser.add_argument("--save", help="write results to this JSON baseline")
+    parser.add_argument("--compare", help="compare against this JSON baseline")
+    parser.add_argument("--tolerance", type=float, default=1.25, help="slowdown ratio counted as a regression")
+    args = parser.parse_args()
+
+    package = load_package()
+    with tempfile.TemporaryDirectory() as tmp:
+        audio_files = {
+            int(d) if float(d).is_integer() else d: synthetic_audio(os.path.join(tmp, f"bench_{d}s.wav"), d)
+            for d in args.durations
+        }
+        cases = [c for c in build_cases(package, audio_files, args.resolutions, args.frames)
+                 if args.filter in c["name"]]
+
+        results = {}
+        print(f"{'case':<48} {'seconds':>9} {'frames/s':>11} {'peak RSS MB':>12} {'delta MB':>9}")
+        for case in cases:
+            result = run_case(case, args.repeat)
+            results[case["name"]] = result
+            fps = f"{result['frames_per_sec']:.1f}" if result["frames_per_sec"] else "-"
+            rss = "-" if result["peak_rss_mb"] is None else f"{result['peak_rss_mb']:.0f}"
+            delta = "-" if result["rss_delta_mb"] is None else f"{result['rss_delta_mb']:.0f}"
+            print(f"{case['name']:<48} {result['seconds']:>9.4f} {fps:>11} {rss:>12} {delta:>9}", flush=True)
+
+    if args.save:
+        os.makedirs(os.path.dirname(os.path.abspath(args.save)), exist_ok=True)
+        with open(args.save, "w", encoding="utf-8") as f:
+            json.dump({
+                "machine": {"platform": platform.platform(), "python": platform.python_version(),
+                            "cpus": os.cpu_count()},
+                "settings": vars(args),
+                "results": results,
+            }, f, indent=2)
+        print(f"\nSaved baseline to {args.save}")
+
+    if args.compare:
+        regressions = compare(results, args.compare, args.tolerance)
+        if regressions:
+            print(f"\n{len(regressions)} case(s) slower than {args.tolerance}x baseline")
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
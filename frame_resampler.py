@@ -0,0 +1,90 @@
+import numpy as np
+
+
+def resample_to_fps(energy_levels, timestamps, fps, mode="mean", release=0.25, duration=None):
+    energy = np.asarray(energy_levels, dtype=np.float64)
+    times = np.asarray(timestamps, dtype=np.float64)
+    n = min(len(energy), len(times))
+    if n == 0:
+        raise ValueError("Empty energy levels or timestamps received")
+    energy, times = energy[:n], times[:n]
+    if np.any(np.diff(times) < 0):
+        order = np.argsort(times, kind="stable")
+        energy, times = energy[order], times[order]
+
+    end = times[-1] if duration is None else max(duration, times[-1])
+    num_bins = int(np.floor(end * fps + 1e-9)) + 1
+    bins = np.clip(np.floor(times * fps + 1e-9).astype(np.int64), 0, num_bins - 1)
+
+    # Samples are sorted, so every occupied bin is one contiguous run
+    starts = np.flatnonzero(np.r_[True, bins[1:] != bins[:-1]])
+    occupied = bins[starts]
+    if mode == "mean":
+        counts = np.diff(np.r_[starts, n])
+        values = np.add.reduceat(energy, starts) / counts
+    else:
+        values = np.maximum.reduceat(energy, starts)
+
+    # Empty bins hold the last occupied bin; leading ones take the first
+    filled = np.zeros(num_bins, dtype=np.int64)
+    filled[occupied] = np.arange(len(occupied))
+    has_value = np.zeros(num_bins, dtype=bool)
+    has_value[occupied] = True
+    source = np.maximum.accumulate(np.where(has_value, np.arange(num_bins), 0))
+    out = values[filled[source]]
+
+    if mode == "peak_hold":
+        # out[i] = max_j(peak[j] * decay**(i - j)), evaluated as a running max in the log domain
+        log_decay = np.log(0.5) / max(release * fps, 1e-9)
+        peaks = np.full(num_bins, -np.inf)
+        positive = values > 0
+        peaks[occupied[positive]] = np.log(values[positive])
+        index = np.arange(num_bins)
+        held = np.exp(np.maximum.accumulate(peaks - index * log_decay) + index * log_decay)
+        out = np.where(np.isfinite(held), held, 0.0)
+        out[:occupied[0]] = out[occupied[0]]
+
+    return out, np.arange(num_bins) / fps
+
+
+class FrameRateResampler:
+    @classmethod
+    def INPUT_TYPES(cls):
+        return {
+            "required": {
+                "energy_levels": ("AUDIO_ENERGY",),
+                "timestamps": ("TIMESTAMPS",),
+                "analysis_type": ("ANALYSIS_TYPE",),
+                "fps": ("FLOAT", {"default": 24.0, "min": 1.0, "max": 240.0, "step": 0.5}),
+                "mode": (["mean", "max", "peak_hold"], {"default": "mean"}),
+            },
+            "optional": {
+                "release": ("FLOAT", {"default": 0.25, "min": 0.01, "max": 10.0, "step": 0.01}),
+            }
+        }
+
+    RETURN_TYPES = ("AUDIO_ENERGY", "TIMESTAMPS", "STRING", "ANALYSIS_TYPE")
+    RETURN_NAMES = ("energy_levels", "timestamps", "debug_info", "analysis_type")
+    FUNCTION = "resample"
+    CATEGORY = "audio/noise"
+
+    def resample(self, energy_levels, timestamps, analysis_type, fps, mode, release=0.25):
+        try:
+            energy, frame_times = resample_to_fps(energy_levels, timestamps, fps, mode, release)
+            debug_info = (
+                f"Resampled {len(timestamps)} -> {len(frame_times)} frames\n"
+                f"FPS: {fps:.2f}, Mode: {mode}\n"
+                f"Duration: {frame_times[-1]:.2f}s"
+            )
+            return (energy.tolist(), frame_times.tolist(), debug_info, analysis_type)
+        except Exception as e:
+            return (list(energy_levels), list(timestamps), f"Error: {str(e)}", analysis_type)
+
+
+NODE_CLASS_MAPPINGS = {
+    "FrameRateResampler": FrameRateResampler
+}
+
+NODE_DISPLAY_NAME_MAPPINGS = {
+    "FrameRateResampler": "Resample Audio Analysis to FPS"
+}
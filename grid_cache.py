@@ -0,0 +1,90 @@
+from collections import OrderedDict
+
+import torch
+
+MAX_ENTRIES = 128
+
+
+class GridCache:
+    """Bounded LRU of coordinate grids and basis tables shared by the generators.
+
+    Entries are keyed by kind, shape, dtype and device. Cached tensors are shared
+    between callers and must not be modified in place.
+    """
+
+    def __init__(self, max_entries=MAX_ENTRIES):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+
+    def get(self, key, build):
+        if key in self._entries:
+            self._entries.move_to_end(key)
+            return self._entries[key]
+        value = build()
+        self._entries[key] = value
+        if len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+        return value
+
+    def clear(self):
+        self._entries.clear()
+
+
+_cache = GridCache()
+
+
+def get_grid_cache():
+    return _cache
+
+
+def linspace(start, end, steps, dtype=torch.float32, device="cpu"):
+    key = ("linspace", float(start), float(end), steps, dtype, str(device))
+    return _cache.get(key, lambda: torch.linspace(start, end, steps, dtype=dtype, device=device))
+
+
+def meshgrid(start, end, rows, cols, dtype=torch.float32, device="cpu"):
+    # Both axes span [start, end]; "ij" indexing, i.e. shape (rows, cols)
+    def build():
+        return torch.meshgrid(
+            linspace(start, end, rows, dtype, device),
+            linspace(start, end, cols, dtype, device),
+            indexing="ij"
+        )
+    return _cache.get(("meshgrid", float(start), float(end), rows, cols, dtype, str(device)), build)
+
+
+def sin_cos_basis(start, end, steps, multiplier, dtype=torch.float32, device="cpu"):
+    # (sin(multiplier * x), cos(multiplier * x)) sampled on linspace(start, end, steps)
+    def build():
+        x = linspace(start, end, steps, dtype, device) * multiplier
+        return torch.sin(x), torch.cos(x)
+    return _cache.get(("sin_cos", float(start), float(end), steps, float(multiplier), dtype, str(device)), build)
+
+
+def rfft_frequencies(rows, cols, dtype=torch.float32, device="cpu"):
+    # Frequencies of an rfft2 half-spectrum of a (rows, cols) field, in cycles
+    # per field: along rows (rows, 1), along columns (1, cols // 2 + 1) and radial
+    def build():
+        k_rows = (torch.fft.fftfreq(rows, dtype=dtype, device=device) * rows).view(-1, 1)
+        k_cols = (torch.fft.rfftfreq(cols, dtype=dtype, device=device) * cols).view(1, -1)
+        return k_rows, k_cols, torch.sqrt(k_rows ** 2 + k_cols ** 2)
+    return _cache.get(("rfft_frequencies", rows, cols, dtype, str(device)), build)
+
+
+def cubic_upsample_matrix(n_out, n_in, dtype=torch.float32, device="cpu"):
+    # (n_out, n_in) weights of bicubic (a = -0.75) interpolation with
+    # align_corners=True, the same kernel as F.interpolate(mode="bicubic").
+    # Upsampling one axis is a matmul, so a 2D upsample is rows @ x @ cols.T.
+    def build():
+        pos = torch.linspace(0, n_in - 1, n_out, dtype=torch.float64)
+        base = pos.floor().long()
+        rows = torch.arange(n_out)
+        weights = torch.zeros((n_out, n_in), dtype=torch.float64)
+        for offset in (-1, 0, 1, 2):
+            d = (pos - (base + offset)).abs()
+            kernel = torch.where(d <= 1, 1.25 * d ** 3 - 2.25 * d ** 2 + 1,
+                                 torch.where(d < 2, -0.75 * (d ** 3 - 5 * d ** 2 + 8 * d - 4), torch.zeros_like(d)))
+            # Taps past an edge are clamped onto it, as interpolate does
+            weights.index_put_((rows, (base + offset).clamp(0, n_in - 1)), kernel, accumulate=True)
+        return weights.to(dtype=dtype, device=device)
+    return _cache.get(("cubic_upsample", n_out, n_in, dtype, str(device)), build)
@@ -0,0 +1,84 @@
+import json
+import os
+
+import numpy as np
+import torch
+
+SAFETENSORS_KEY = "latent_tensor"
+SAFETENSORS_DTYPES = {torch.float32: "F32", torch.float16: "F16", torch.bfloat16: "BF16"}
+NPY_DTYPES = {torch.float32: np.float32, torch.float16: np.float16}
+
+
+class NpyLatentWriter:
+    def __init__(self, path, shape, dtype=torch.float32):
+        if dtype not in NPY_DTYPES:
+            raise ValueError(f"{dtype} latents need a .safetensors output path; .npy has no such type")
+        self.path = path
+        self.shape = tuple(shape)
+        self.dtype = dtype
+        self._array = np.lib.format.open_memmap(path, mode="w+", dtype=NPY_DTYPES[dtype], shape=self.shape)
+
+    def write(self, start, latents):
+        self._array[start:start + len(latents)] = latents.detach().to("cpu", self.dtype).numpy()
+        # Flush per chunk so dirty pages never accumulate beyond one chunk
+        self._array.flush()
+
+    def close(self):
+        if self._array is not None:
+            self._array.flush()
+            self._array = None
+
+
+class SafetensorsLatentWriter:
+    def __init__(self, path, shape, dtype=torch.float32):
+        self.path = path
+        self.shape = tuple(shape)
+        self.dtype = dtype
+        self._frame_bytes = int(np.prod(self.shape[1:])) * dtype.itemsize
+        nbytes = self.shape[0] * self._frame_bytes
+
+        # The header is fully determined by the shape, so it can be written up
+        # front and frames streamed into place afterwards.
+        header = json.dumps({
+            SAFETENSORS_KEY: {
+                "dtype": SAFETENSORS_DTYPES[dtype], "shape": list(self.shape), "data_offsets": [0, nbytes]
+            }
+        }).encode("utf-8")
+        header += b" " * (-len(header) % 8)
+        self._data_start = 8 + len(header)
+
+        self._file = open(path, "wb")
+        self._file.write(len(header).to_bytes(8, "little"))
+        self._file.write(header)
+        self._file.truncate(self._data_start + nbytes)
+
+    def write(self, start, latents):
+        # Viewed as bytes so bfloat16, which numpy lacks, goes through unchanged
+        data = latents.detach().to("cpu", self.dtype).contiguous().view(torch.uint8).numpy()
+        self._file.seek(self._data_start + start * self._frame_bytes)
+        self._file.write(data.tobytes())
+
+    def close(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+
+def open_latent_writer(path, shape, dtype=torch.float32):
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    if path.endswith(".safetensors"):
+        return SafetensorsLatentWriter(path, shape, dtype)
+    return NpyLatentWriter(path, shape, dtype)
+
+
+def write_latent_chunks(chunks, path, shape, dtype=torch.float32):
+    """Write ``(start, latents)`` chunks to disk without holding more than one in memory."""
+    writer = open_latent_writer(path, shape, dtype)
+    try:
+        for start, latents in chunks:
+            writer.write(start, latents)
+    finally:
+        writer.close()
+    return path
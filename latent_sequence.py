@@ -0,0 +1,207 @@
+import hashlib
+import json
+import os
+
+import numpy as np
+import torch
+
+# Bump when the on-disk layout changes
+SEQUENCE_VERSION = 1
+SEQUENCE_SUFFIX = ".latentseq"
+INDEX_NAME = "index.json"
+TIMESTAMPS_NAME = "timestamps.npy"
+# numpy has no bfloat16, so those shards hold the raw bits as uint16
+SHARD_DTYPES = {"float32": (torch.float32, np.float32), "float16": (torch.float16, np.float16),
+                "bfloat16": (torch.bfloat16, np.uint16)}
+
+
+def _dtype_name(dtype):
+    return str(dtype).replace("torch.", "")
+
+
+def settings_signature(settings):
+    """Stable digest of the render settings; a sequence only resumes under the same one."""
+    return hashlib.sha256(json.dumps(settings, sort_keys=True, default=str).encode("utf-8")).hexdigest()
+
+
+class LatentSequenceWriter:
+    """Writes a latent sequence directory shard by shard.
+
+    The directory holds ``index.json``, ``timestamps.npy`` and one ``.npy``
+    shard per ``shard_frames`` frames. A shard is marked complete in the index
+    only after its last frame is flushed, so an interrupted run reopened with
+    the same signature re-renders just the shards that never completed.
+    """
+
+    def __init__(self, directory, frame_shape, timestamps, dtype=torch.float32, shard_frames=256, signature=""):
+        if _dtype_name(dtype) not in SHARD_DTYPES:
+            raise ValueError(f"latent sequences cannot store {dtype}")
+        self.directory = directory
+        self._index_path = os.path.join(directory, INDEX_NAME)
+        # An empty track still renders one frame; keep one timestamp per frame
+        timestamps = np.asarray(timestamps, dtype=np.float64) if len(timestamps) else np.zeros(1)
+        total = len(timestamps)
+        index = {
+            "version": SEQUENCE_VERSION,
+            "frames": total,
+            "frame_shape": list(frame_shape),
+            "dtype": _dtype_name(dtype),
+            "shard_frames": int(shard_frames),
+            "signature": signature,
+        }
+
+        previous = self._read_index()
+        if previous is not None and {k: previous.get(k) for k in index} == index:
+            index["shards"] = previous["shards"]
+        else:
+            if previous is not None:
+                self._remove_shards(previous)
+            index["shards"] = [
+                {"file": f"shard_{i:05d}.npy", "start": start, "stop": min(start + int(shard_frames), total),
+                 "complete": False}
+                for i, start in enumerate(range(0, total, int(shard_frames)))
+            ]
+            os.makedirs(directory, exist_ok=True)
+            np.save(os.path.join(directory, TIMESTAMPS_NAME), timestamps)
+        self.index = index
+        self._save_index()
+
+    def _read_index(self):
+        try:
+            with open(self._index_path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def _remove_shards(self, index):
+        for shard in index.get("shards", []):
+            try:
+                os.remove(os.path.join(self.directory, shard["file"]))
+            except OSError:
+                pass
+
+    def _save_index(self):
+        tmp_path = self._index_path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(self.index, f)
+        os.replace(tmp_path, self._index_path)
+
+    def pending_shards(self):
+        """``(start, stop)`` frame ranges of the shards still to be rendered."""
+        return [(s["start"], s["stop"]) for s in self.index["shards"] if not s["complete"]]
+
+    def write_shard(self, start, chunks):
+        """Write the ``(start, latents)`` chunks covering the shard beginning at frame ``start``."""
+        shard = next(s for s in self.index["shards"] if s["start"] == start)
+        torch_dtype, np_dtype = SHARD_DTYPES[self.index["dtype"]]
+        shape = (shard["stop"] - shard["start"],) + tuple(self.index["frame_shape"])
+        array = np.lib.format.open_memmap(os.path.join(self.directory, shard["file"]), mode="w+", dtype=np_dtype,
+                                          shape=shape)
+        try:
+            for first, latents in chunks:
+                data = latents.detach().to("cpu", torch_dtype).contiguous()
+                if torch_dtype == torch.bfloat16:
+                    data = data.view(torch.int16)
+                offset = first - shard["start"]
+                array[offset:offset + len(data)] = data.numpy().view(np_dtype)
+            array.flush()
+        finally:
+            del array
+        shard["complete"] = True
+        self._save_index()
+
+    @property
+    def complete(self):
+        return all(s["complete"] for s in self.index["shards"])
+
+
+def write_latent_sequence(directory, render_range, frame_shape, timestamps, dtype=torch.float32, shard_frames=256,
+                          signature=""):
+    """Render and write every pending shard; ``render_range(start, stop)`` yields ``(start, latents)`` chunks.
+
+    Returns the number of frames rendered by this call.
+    """
+    writer = LatentSequenceWriter(directory, frame_shape, timestamps, dtype, shard_frames, signature)
+    rendered = 0
+    for start, stop in writer.pending_shards():
+        writer.write_shard(start, render_range(start, stop))
+        rendered += stop - start
+    return rendered
+
+
+class LatentSequence:
+    """Read-only view of a complete latent sequence directory.
+
+    Shards are memory-mapped copy-on-write, so a range inside one shard is a
+    zero-copy tensor view; ranges spanning shards are concatenated.
+    """
+
+    def __init__(self, directory):
+        self.directory = directory
+        with open(os.path.join(directory, INDEX_NAME), "r", encoding="utf-8") as f:
+            self.index = json.load(f)
+        if self.index.get("version") != SEQUENCE_VERSION:
+            raise ValueError(f"{directory} has latent sequence version {self.index.get('version')}, "
+                             f"expected {SEQUENCE_VERSION}")
+        incomplete = [s["file"] for s in self.index["shards"] if not s["complete"]]
+        if incomplete:
+            raise ValueError(f"{directory} is incomplete ({len(incomplete)} shards missing); rerun the writer")
+        self.dtype = SHARD_DTYPES[self.index["dtype"]][0]
+        self.timestamps = np.load(os.path.join(directory, TIMESTAMPS_NAME), mmap_mode="r")
+        self._shards = {}
+
+    def __len__(self):
+        return self.index["frames"]
+
+    def _shard(self, shard):
+        if shard["file"] not in self._shards:
+            array = np.load(os.path.join(self.directory, shard["file"]), mmap_mode="c")
+            tensor = torch.from_numpy(array)
+            if self.dtype == torch.bfloat16:
+                tensor = tensor.view(torch.bfloat16)
+            self._shards[shard["file"]] = tensor
+        return self._shards[shard["file"]]
+
+    def frames(self, start=0, stop=None):
+        stop = len(self) if stop is None else min(stop, len(self))
+        if not 0 <= start < stop:
+            raise IndexError(f"frame range {start}:{stop} is empty or outside 0:{len(self)}")
+        parts = [
+            self._shard(s)[max(start, s["start"]) - s["start"]:min(stop, s["stop"]) - s["start"]]
+            for s in self.index["shards"] if s["start"] < stop and s["stop"] > start
+        ]
+        return parts[0] if len(parts) == 1 else torch.cat(parts)
+
+
+class LoadLatentSequence:
+    @classmethod
+    def INPUT_TYPES(cls):
+        return {
+            "required": {
+                "sequence_path": ("STRING", {"multiline": False, "default": "output/audio_latents" + SEQUENCE_SUFFIX}),
+                "start_frame": ("INT", {"default": 0, "min": 0, "max": 0xffffffff}),
+                "frame_count": ("INT", {"default": 0, "min": 0, "max": 0xffffffff}),
+            },
+        }
+
+    RETURN_TYPES = ("LATENT", "TIMESTAMPS")
+    RETURN_NAMES = ("latent", "timestamps")
+    FUNCTION = "load_frames"
+    CATEGORY = "audio/noise"
+
+    def load_frames(self, sequence_path, start_frame, frame_count):
+        # frame_count 0 loads through the last frame
+        sequence = LatentSequence(sequence_path)
+        stop = start_frame + frame_count if frame_count else None
+        samples = sequence.frames(start_frame, stop)
+        timestamps = sequence.timestamps[start_frame:start_frame + len(samples)].tolist()
+        return ({"samples": samples}, timestamps)
+
+
+NODE_CLASS_MAPPINGS = {
+    "LoadLatentSequence": LoadLatentSequence
+}
+
+NODE_DISPLAY_NAME_MAPPINGS = {
+    "LoadLatentSequence": "Load Latent Sequence Frames"
+}
@@ -1,6 +1,13 @@
-import librosa
 import numpy as np
 
+from .analysis_cache import get_analysis_cache
+from .profiling import NULL_PROFILER, StageProfiler
+
+ANALYSIS_TYPES = ["default", "onset", "segment", "tempo", "mel", "spectral", "second", "half_second", "beat"]
+
+# librosa (with numba, scipy and sklearn) and the feature module built on it are
+# imported on first use, so registering the nodes at server start stays cheap.
+
 class LibrosaAnalysisNode:
     @classmethod
     def INPUT_TYPES(cls):
@@ -10,7 +17,7 @@ class LibrosaAnalysisNode:
                     "multiline": False,
                     "default": "path/to/audio/file.wav",
                 }),
-                "analysis_type": (["default", "onset", "segment", "tempo", "mel", "spectral", "second", "half_second", "beat"], {
+                "analysis_type": (ANALYSIS_TYPES, {
                     "default": "default",
                 }),
                 "window_size": ("INT", {
@@ -20,6 +27,11 @@ class LibrosaAnalysisNode:
                     "step": 128
                 }),
             },
+            "optional": {
+                "use_cache": ("BOOLEAN", {"default": True}),
+                "decode_mode": (["full", "streaming"], {"default": "full"}),
+                "profile": ("BOOLEAN", {"default": False}),
+            },
         }
     
     RETURN_TYPES = ("AUDIO_ENERGY", "TIMESTAMPS", "STRING", "ANALYSIS_TYPE")
@@ -27,81 +39,148 @@ class LibrosaAnalysisNode:
     FUNCTION = "analyze_audio"
     CATEGORY = "Audio Processing"
 
-    def analyze_audio(self, audio_file, analysis_type, window_size):
-        try:
-            y, sr = librosa.load(audio_file, sr=None)
-            duration = librosa.get_duration(y=y, sr=sr)
+    def _compute_analysis(self, features, analysis_type, window_size):
+        import librosa
+
+        sr = features.sr
+        energy_levels = []
+        timestamps = []
+        
+        if analysis_type == "onset":
+            onset_envelope = features.onset_envelope
+            with features.profiler.stage("onset_detect"):
+                onset_frames = librosa.onset.onset_detect(onset_envelope=onset_envelope, sr=sr)
+            timestamps = librosa.frames_to_time(onset_frames, sr=sr)
+            energy_levels = features.rms(window_size)[onset_frames]
             
-            energy_levels = []
-            timestamps = []
+        elif analysis_type == "segment":
+            # Boundaries are onsets of the spectral flux of the STFT magnitude
+            flux_envelope = features.spectral_flux_envelope
+            with features.profiler.stage("onset_detect"):
+                segment_frames = librosa.onset.onset_detect(onset_envelope=flux_envelope, sr=sr)
+            timestamps = librosa.frames_to_time(segment_frames, sr=sr)
+            rms = features.rms(window_size)
+            energy_levels = rms[np.minimum(segment_frames, len(rms) - 1)]
             
-            if analysis_type == "onset":
-                onset_frames = librosa.onset.onset_detect(y=y, sr=sr)
-                timestamps = librosa.frames_to_time(onset_frames, sr=sr)
-                energy_levels = [librosa.feature.rms(y=y, frame_length=window_size)[0][frame] for frame in onset_frames]
-                
-            elif analysis_type == "segment":
-                # Use librosa's segment boundaries detection
-                S = np.abs(librosa.stft(y))
-                segments = librosa.segment.detect_spectral_onsets(S)
-                timestamps = librosa.frames_to_time(np.where(segments)[0], sr=sr)
-                energy_levels = [librosa.feature.rms(y=y, frame_length=window_size)[0][frame] for frame in np.where(segments)[0]]
-                
-            elif analysis_type == "tempo":
-                onset_env = librosa.onset.onset_strength(y=y, sr=sr)
-                tempo_frames = librosa.frames_to_time(np.arange(len(onset_env)), sr=sr)
-                timestamps = tempo_frames
-                energy_levels = onset_env.tolist()
-                
-            elif analysis_type == "mel":
-                mel_spec = librosa.feature.melspectrogram(y=y, sr=sr)
-                timestamps = librosa.frames_to_time(range(mel_spec.shape[1]), sr=sr)
-                energy_levels = np.mean(mel_spec, axis=0).tolist()
-                
-            elif analysis_type == "spectral":
-                spec_cent = librosa.feature.spectral_centroid(y=y, sr=sr)
-                timestamps = librosa.frames_to_time(range(spec_cent.shape[1]), sr=sr)
-                energy_levels = spec_cent[0].tolist()
-                
-            else:  # default, second, half_second, beat
-                hop_length = window_size // 4
-                energy = librosa.feature.rms(y=y, frame_length=window_size, hop_length=hop_length)[0]
-                timestamps = librosa.frames_to_time(range(len(energy)), sr=sr, hop_length=hop_length)
+        elif analysis_type == "tempo":
+            onset_env = features.onset_envelope
+            timestamps = librosa.frames_to_time(np.arange(len(onset_env)), sr=sr)
+            energy_levels = onset_env
+            
+        elif analysis_type == "mel":
+            energy_levels = features.mel_mean
+            timestamps = librosa.frames_to_time(range(len(energy_levels)), sr=sr)
+            
+        elif analysis_type == "spectral":
+            spec_cent = features.spectral_centroid
+            timestamps = librosa.frames_to_time(range(len(spec_cent)), sr=sr)
+            energy_levels = spec_cent
+            
+        else:  # default, second, half_second, beat
+            hop_length = window_size // 4
+            energy = features.rms(window_size, hop_length)
+            timestamps = librosa.frames_to_time(range(len(energy)), sr=sr, hop_length=hop_length)
+            
+            if analysis_type == "second":
+                idx = [i for i, t in enumerate(timestamps) if round(t, 3) % 1 == 0]
+            elif analysis_type == "half_second":
+                idx = [i for i, t in enumerate(timestamps) if round(t * 2, 3) % 1 == 0]
+            elif analysis_type == "beat":
+                onset_envelope = features.onset_envelope_median
+                with features.profiler.stage("beat_track"):
+                    tempo, beat_frames = librosa.beat.beat_track(onset_envelope=onset_envelope, sr=sr)
+                timestamps = librosa.frames_to_time(beat_frames, sr=sr)
+                energy_levels = energy[np.minimum(beat_frames, len(energy) - 1)]
+            else:  # default
+                idx = slice(None)
                 
-                if analysis_type == "second":
-                    idx = [i for i, t in enumerate(timestamps) if round(t, 3) % 1 == 0]
-                elif analysis_type == "half_second":
-                    idx = [i for i, t in enumerate(timestamps) if round(t * 2, 3) % 1 == 0]
-                elif analysis_type == "beat":
-                    tempo, beat_frames = librosa.beat.beat_track(y=y, sr=sr)
-                    timestamps = librosa.frames_to_time(beat_frames, sr=sr)
-                    energy_levels = [energy[min(i, len(energy)-1)] for i in beat_frames]
-                else:  # default
-                    energy_levels = energy.tolist()
-                    
-                if analysis_type in ["second", "half_second"]:
-                    energy_levels = [energy[i] for i in idx]
-                    timestamps = [timestamps[i] for i in idx]
-                elif analysis_type not in ["beat"]:
-                    energy_levels = energy.tolist()
-                    timestamps = timestamps.tolist()
-
-            # Normalize energy levels
-            energy_levels = np.array(energy_levels)
-            energy_levels = (energy_levels - energy_levels.min()) / (energy_levels.max() - energy_levels.min())
+            if analysis_type != "beat":
+                energy_levels = energy[idx]
+                timestamps = timestamps[idx]
+
+        # Normalize energy levels
+        energy_levels = np.array(energy_levels, dtype=np.float64)
+        energy_levels = (energy_levels - energy_levels.min()) / (energy_levels.max() - energy_levels.min())
+        return energy_levels, np.asarray(timestamps, dtype=np.float64)
+
+    def _load_features(self, audio_file, window_size, decode_mode, profiler=NULL_PROFILER):
+        from .audio_features import AudioFeatures, StreamingAudioFeatures
+
+        if decode_mode == "streaming":
+            return StreamingAudioFeatures(audio_file, window_size, profiler=profiler)
+        return AudioFeatures.from_file(audio_file, profiler)
+
+    def _run_analyses(self, audio_file, analysis_types, window_size, use_cache, decode_mode="full",
+                      profiler=NULL_PROFILER):
+        cache = get_analysis_cache() if use_cache else None
+        features = None
+        results = {}
+        for analysis_type in analysis_types:
+            with profiler.stage("cache_lookup"):
+                cached = cache.get(audio_file, analysis_type, window_size) if cache else None
+            if cached is not None:
+                results[analysis_type] = (cached["energy"], cached["timestamps"], float(cached["duration"]), True)
+                continue
+            if features is None:
+                features = self._load_features(audio_file, window_size, decode_mode, profiler)
+            with profiler.stage(f"analysis:{analysis_type}") as record:
+                energy_levels, timestamps = self._compute_analysis(features, analysis_type, window_size)
+                record["frames"] = len(energy_levels)
+            if cache:
+                with profiler.stage("cache_store"):
+                    cache.put(audio_file, analysis_type, window_size,
+                              energy=energy_levels, timestamps=timestamps, duration=np.float64(features.duration))
+            results[analysis_type] = (energy_levels, timestamps, features.duration, False)
+        return results, cache
+
+    def analyze_audio(self, audio_file, analysis_type, window_size, use_cache=True, decode_mode="full",
+                      profile=False):
+        profiler = StageProfiler("LibrosaAnalysisNode", True if profile else None)
+        try:
+            results, cache = self._run_analyses(audio_file, [analysis_type], window_size, use_cache, decode_mode,
+                                                profiler)
+            energy_levels, timestamps, duration, hit = results[analysis_type]
             
-            analysis_text = (
-                f"Analysis Type: {analysis_type}\n"
-                f"Duration: {duration:.2f} seconds\n"
-                f"Measurements: {len(energy_levels)}\n"
-                f"Window Size: {window_size}"
-            )
+            analysis_text = self._analysis_text(analysis_type, duration, len(energy_levels), window_size, cache, hit)
+            if profiler.enabled:
+                analysis_text += "\n" + profiler.finish()
             
-            return (energy_levels.tolist(), timestamps, analysis_text, analysis_type)
+            return (energy_levels.tolist(), timestamps.tolist(), analysis_text, analysis_type)
             
         except Exception as e:
             return ([1.0], [0.0], f"Error: {str(e)}", "default")
 
+    def _analysis_text(self, analysis_type, duration, measurements, window_size, cache, hit):
+        text = (
+            f"Analysis Type: {analysis_type}\n"
+            f"Duration: {duration:.2f} seconds\n"
+            f"Measurements: {measurements}\n"
+            f"Window Size: {window_size}"
+        )
+        if cache:
+            text += f"\nCache: {'hit' if hit else 'miss'} ({cache.stats_text()})"
+        return text
+
+    def analyze_audio_multi(self, audio_file, analysis_types, window_size, use_cache=True, decode_mode="full"):
+        """Run several analysis types against one decode of ``audio_file``.
+
+        Python API for scripts and other nodes. Returns
+        ``{analysis_type: (energy_levels, timestamps, analysis_text)}``; shared
+        features (STFT, mel, RMS, onset envelope) are computed once for all
+        types. On failure every type gets ``analyze_audio``'s fallback,
+        ``([1.0], [0.0], "Error: ...")``.
+        """
+        try:
+            results, cache = self._run_analyses(audio_file, analysis_types, window_size, use_cache, decode_mode)
+            return {
+                analysis_type: (energy_levels.tolist(), timestamps.tolist(),
+                                self._analysis_text(analysis_type, duration, len(energy_levels), window_size,
+                                                    cache, hit))
+                for analysis_type, (energy_levels, timestamps, duration, hit) in results.items()
+            }
+        except Exception as e:
+            return {analysis_type: ([1.0], [0.0], f"Error: {str(e)}") for analysis_type in analysis_types}
+
 NODE_CLASS_MAPPINGS = {
     "LibrosaAnalysisNode": LibrosaAnalysisNode
 }
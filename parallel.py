@@ -0,0 +1,77 @@
+import os
+import sys
+
+import torch
+import torch.multiprocessing as mp
+
+_MASK64 = (1 << 64) - 1
+
+
+def frame_seed(master_seed, index):
+    # splitmix64 of (master_seed, index): well-mixed, independent per frame
+    z = (int(master_seed) + (int(index) + 1) * 0x9E3779B97F4A7C15) & _MASK64
+    z = ((z ^ (z >> 30)) * 0xBF58476D1CE4E5B9) & _MASK64
+    z = ((z ^ (z >> 27)) * 0x94D049BB133111EB) & _MASK64
+    return z ^ (z >> 31)
+
+
+def frame_generators(master_seed, indices):
+    """One torch.Generator per frame, or None to use the global RNG."""
+    if master_seed is None:
+        return None
+    return [torch.Generator().manual_seed(frame_seed(master_seed, i)) for i in indices]
+
+
+def random_frames(fn, shape, count, generators=None):
+    # Draw `count` frames of `shape` from `fn` (torch.rand/randn); with per-frame
+    # generators each frame's values depend only on its own seed.
+    if generators is None:
+        return fn((count,) + tuple(shape))
+    return torch.stack([fn(tuple(shape), generator=g) for g in generators])
+
+
+def process_context():
+    """Multiprocessing context for worker pools: fork where available, else spawn."""
+    method = "fork" if "fork" in mp.get_all_start_methods() else "spawn"
+    if method == "spawn":
+        # Spawned workers re-import this package by name from the parent's path
+        package_parent = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        if package_parent not in sys.path:
+            sys.path.append(package_parent)
+    return mp.get_context(method)
+
+
+def _run_shard(task, out, start, stop, threads):
+    torch.set_num_threads(threads)
+    task(out, start, stop)
+
+
+def render_sharded(task, total, frame_shape, workers=1, dtype=torch.float32, memory_format=torch.contiguous_format):
+    """Fill a (total, *frame_shape) tensor by calling ``task(out, start, stop)``.
+
+    With more than one worker the frame range is split into contiguous shards,
+    each rendered by its own process directly into a shared-memory output
+    tensor, so no latents are pickled back to the parent.
+    """
+    out = torch.empty((total,) + tuple(frame_shape), dtype=dtype, memory_format=memory_format)
+    workers = max(1, min(int(workers), total))
+    if workers == 1:
+        task(out, 0, total)
+        return out
+
+    out.share_memory_()
+    ctx = process_context()
+    threads = max(1, torch.get_num_threads() // workers)
+    bounds = [total * w // workers for w in range(workers + 1)]
+    processes = [
+        ctx.Process(target=_run_shard, args=(task, out, bounds[w], bounds[w + 1], threads))
+        for w in range(workers)
+    ]
+    for process in processes:
+        process.start()
+    for process in processes:
+        process.join()
+    failed = [p.exitcode for p in processes if p.exitcode != 0]
+    if failed:
+        raise RuntimeError(f"{len(failed)} of {workers} noise workers failed (exit codes {failed})")
+    return out
@@ -0,0 +1,14 @@
+import torch
+
+# Dtypes the generators can compute and return latents in. Arguments of trig
+# functions and fbm octave sums stay in float32 regardless; see the generators.
+COMPUTE_DTYPES = {
+    "float32": torch.float32,
+    "bfloat16": torch.bfloat16,
+    "float16": torch.float16,
+}
+
+MEMORY_FORMATS = {
+    "contiguous": torch.contiguous_format,
+    "channels_last": torch.channels_last,
+}
@@ -0,0 +1,130 @@
+import itertools
+import json
+import os
+import sys
+import time
+from contextlib import contextmanager
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+# Any value other than "" or "0" profiles every node run
+PROFILE_ENV = "AUDIO_LATENT_PROFILE"
+# When set, each profiled run also writes a Chrome-trace JSON file here
+TRACE_DIR_ENV = "AUDIO_LATENT_TRACE_DIR"
+
+_trace_sequence = itertools.count()
+
+
+def _peak_rss_mb():
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in bytes on macOS and kilobytes elsewhere
+    return peak / 2 ** 20 if sys.platform == "darwin" else peak / 1024
+
+
+class StageProfiler:
+    """Opt-in wall-clock timer for the named stages of one node run.
+
+    ``stage()`` is a context manager that yields a record; callers may set
+    ``record["frames"]`` and ``record["tensor_bytes"]`` on it. Stages nest.
+    When disabled, every call is a no-op, so instrumented code can call it
+    unconditionally.
+    """
+
+    def __init__(self, node, enabled=None):
+        if enabled is None:
+            enabled = os.environ.get(PROFILE_ENV, "") not in ("", "0")
+        self.node = node
+        self.enabled = bool(enabled)
+        self.events = []
+        self._depth = 0
+        self._origin = time.perf_counter()
+
+    @contextmanager
+    def stage(self, name, frames=0):
+        if not self.enabled:
+            yield {}
+            return
+        record = {"name": name, "frames": frames, "tensor_bytes": 0, "depth": self._depth}
+        self._depth += 1
+        start = time.perf_counter()
+        try:
+            yield record
+        finally:
+            end = time.perf_counter()
+            self._depth -= 1
+            record.update(start=start - self._origin, seconds=end - start, peak_rss_mb=_peak_rss_mb())
+            self.events.append(record)
+
+    def summary(self):
+        if not self.events:
+            return ""
+        # One line per stage name, in the order stages first started
+        totals = {}
+        for event in sorted(self.events, key=lambda e: e["start"]):
+            total = totals.setdefault(event["name"], {"depth": event["depth"], "calls": 0, "seconds": 0.0,
+                                                      "frames": 0, "tensor_bytes": 0, "peak_rss_mb": None})
+            total["calls"] += 1
+            total["seconds"] += event["seconds"]
+            total["frames"] += event["frames"]
+            total["tensor_bytes"] = max(total["tensor_bytes"], event["tensor_bytes"])
+            total["peak_rss_mb"] = event["peak_rss_mb"]
+
+        lines = [f"Profile ({self.node}):"]
+        for name, total in totals.items():
+            line = "  " * (total["depth"] + 1) + f"{name}: {total['seconds'] * 1000:.1f} ms"
+            if total["calls"] > 1:
+                line += f" x{total['calls']}"
+            if total["frames"]:
+                line += f", {total['frames']} frames ({total['frames'] / max(total['seconds'], 1e-9):.0f}/s)"
+            if total["tensor_bytes"]:
+                line += f", {total['tensor_bytes'] / 2 ** 20:.1f} MB tensors"
+            if total["peak_rss_mb"] is not None:
+                line += f", peak RSS {total['peak_rss_mb']:.0f} MB"
+            lines.append(line)
+        return "\n".join(lines)
+
+    def chrome_trace(self):
+        # Complete ("X") events; chrome://tracing and Perfetto nest them by time
+        pid = os.getpid()
+        return {
+            "displayTimeUnit": "ms",
+            "traceEvents": [
+                {
+                    "name": event["name"], "cat": self.node, "ph": "X", "pid": pid, "tid": 0,
+                    "ts": event["start"] * 1e6, "dur": event["seconds"] * 1e6,
+                    "args": {"frames": event["frames"], "tensor_mb": event["tensor_bytes"] / 2 ** 20,
+                             "peak_rss_mb": event["peak_rss_mb"]},
+                }
+                for event in self.events
+            ],
+        }
+
+    def write_trace(self, path):
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(self.chrome_trace(), f)
+        return path
+
+    def finish(self, note=None):
+        """Return the summary text, writing a trace file first if TRACE_DIR_ENV is set."""
+        if not self.enabled:
+            return ""
+        text = self.summary()
+        if note:
+            text += f"\n{note}"
+        directory = os.environ.get(TRACE_DIR_ENV)
+        if directory and self.events:
+            name = f"{self.node}-{time.strftime('%Y%m%d-%H%M%S')}-{os.getpid()}-{next(_trace_sequence)}.json"
+            text += f"\nTrace: {self.write_trace(os.path.join(directory, name))}"
+        return text
+
+
+# Shared stand-in for code paths run without a profiler
+NULL_PROFILER = StageProfiler("disabled", enabled=False)